@@ -57,6 +57,8 @@ from user_container.logger import (
     log_debug,
     log_llm_request,
     log_llm_response,
+    is_debug,
+    flush_logs,
 )
 from user_container.tools.registry import ToolRegistry
 from user_container.agent.delegate_executor import DelegateExecutor
@@ -484,6 +486,7 @@ class Agent:
         # Standard execution loop (same for all depths)
         step_count = 0
         while step_count < self.max_steps:
+            flush_logs()  # Emit buffered output of the previous step
             step_count += 1
             log_step(step_count, self.max_steps)
 
@@ -1707,8 +1710,9 @@ This fills the template, saves a `_filled.docx` alongside the PDF, and converts
     ) -> Dict[str, Any]:
         """Call LLM via unified client with streaming for fast cancellation."""
         try:
-            log_debug(f"Calling LLM ({self.llm.model})...")
-            log_llm_request(messages, component="Agent")
+            if is_debug():
+                log_debug(f"Calling LLM ({self.llm.model})...")
+                log_llm_request(messages, component="Agent")
 
             response = self.llm.chat(
                 messages=messages,
@@ -1722,12 +1726,12 @@ This fills the template, saves a `_filled.docx` alongside the PDF, and converts
                 cancellation_check=self._is_cancelled  # Enable fast cancellation during streaming
             )
 
-            log_llm_response(response.content, response.tool_calls, component="Agent")
-
-            if response.has_tool_calls:
-                log_debug(f"LLM returned {len(response.tool_calls)} tool calls")
-            else:
-                log_debug("LLM returned text response")
+            if is_debug():
+                log_llm_response(response.content, response.tool_calls, component="Agent")
+                if response.has_tool_calls:
+                    log_debug(f"LLM returned {len(response.tool_calls)} tool calls")
+                else:
+                    log_debug("LLM returned text response")
 
             # Log warning if response was truncated
             if response.truncated:
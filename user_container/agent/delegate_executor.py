@@ -138,6 +138,7 @@ class DelegateExecutor:
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_content}
             ]
+            last_assistant_idx = -1  # tracked for log_llm_request
 
             # 4. Execute loop (max 10 steps)
             for step in range(self.MAX_STEPS):
@@ -158,7 +159,8 @@ class DelegateExecutor:
                 if step > 0:
                     self._emit_activity("delegate_step", f"Sub-agent step {step + 1}/{self.MAX_STEPS}")
 
-                log_llm_request(messages, component="DelegateExecutor")
+                log_llm_request(messages, component="DelegateExecutor",
+                                last_assistant_idx=last_assistant_idx)
 
                 try:
                     response = self.llm.chat(
@@ -195,6 +197,7 @@ class DelegateExecutor:
                     assistant_msg = {"role": "assistant", "tool_calls": response.tool_calls}
                     if response.content:
                         assistant_msg["content"] = response.content
+                    last_assistant_idx = len(messages)
                     messages.append(assistant_msg)
 
                     # Add tool results
@@ -160,6 +160,7 @@ class ExploreExecutor:
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_content}
             ]
+            last_assistant_idx = -1  # tracked for log_llm_request
 
             # Execute exploration loop (max 15 steps)
             for step in range(self.MAX_STEPS):
@@ -186,7 +187,8 @@ class ExploreExecutor:
                         f"Exploration step {step + 1}/{self.MAX_STEPS}"
                     )
 
-                log_llm_request(messages, component="ExploreExecutor")
+                log_llm_request(messages, component="ExploreExecutor",
+                                last_assistant_idx=last_assistant_idx)
 
                 try:
                     response = self.llm.chat(
@@ -226,6 +228,7 @@ class ExploreExecutor:
                     assistant_msg = {"role": "assistant", "tool_calls": response.tool_calls}
                     if response.content:
                         assistant_msg["content"] = response.content
+                    last_assistant_idx = len(messages)
                     messages.append(assistant_msg)
 
                     # Add tool results
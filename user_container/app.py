@@ -250,7 +250,7 @@ async def subdomain_proxy_middleware(request: Request, call_next):
 
 # --- Initialize Services ---
 
-db = DB(settings.db_path)
+db = DB(settings.db_path, job_synchronous=settings.job_db_synchronous)
 
 # Initialize UsageTracker singleton for Internal API (apps using LLM/skills)
 from user_container.usage import UsageTracker
@@ -702,7 +702,7 @@ def list_conversations():
     job_queue = get_job_queue()
     pending_conversations = set()  # waiting_for_input
     active_conversations = set()   # running or pending
-    for job_data in job_queue._job_cache.values():
+    for job_data in job_queue.get_cached_jobs():
         status = job_data.get("status")
         conv_id = job_data.get("conversation_id")
         if status == "waiting_for_input":
@@ -37,6 +37,12 @@ def _bi(env_key: str, default: str) -> str:
     return _build_info.get(env_key, default)
 
 
+def _env_choice(env_key: str, choices: tuple, default: str) -> str:
+    """Get an upper-cased env var if it is one of choices, else default."""
+    val = os.getenv(env_key, default).strip().upper()
+    return val if val in choices else default
+
+
 class Settings(BaseModel):
     # Build info
     build_version: str = _bi("BUILD_VERSION", "dev")
@@ -49,6 +55,9 @@ class Settings(BaseModel):
     skills_dir: str = os.getenv("SKILLS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills"))
     data_dir: str = os.getenv("DATA_DIR", os.path.join(os.path.expanduser("~"), ".zeno", "data"))
     db_path: str = os.getenv("DB_PATH", os.path.join(os.path.expanduser("~"), ".zeno", "data", "runtime.db"))
+    # PRAGMA synchronous for job writes (NORMAL trades durability of the whole
+    # runtime.db for fewer fsyncs); validated since it is formatted into the PRAGMA
+    job_db_synchronous: str = _env_choice("JOB_DB_SYNCHRONOUS", ("NORMAL", "FULL", "EXTRA"), "FULL")
 
     # Port pool for spawned user apps
     app_port_min: int = int(os.getenv("APP_PORT_MIN", "3100"))
@@ -89,6 +98,8 @@ class Settings(BaseModel):
 
     # Job settings
     max_job_runtime: int = int(os.getenv("MAX_JOB_RUNTIME", "1800"))  # Max job runtime in seconds (default 30 min)
+    scheduler_backend: str = os.getenv("SCHEDULER_BACKEND", "apscheduler").lower()  # "apscheduler" or "light" (heap scheduler)
+    runner_cpus: Optional[str] = os.getenv("RUNNER_CPUS")  # CPU list for shell commands, e.g. "0-3" or "half" (None = no pinning)
 
     # External APIs
     serper_api_key: Optional[str] = os.getenv("SERPER_API_KEY")
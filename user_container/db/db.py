@@ -1,3 +1,4 @@
+import json
 import sqlite3
 import threading
 import time
@@ -19,12 +20,16 @@ class JobActivity:
     is_error: bool = False
 
 class DB:
-    def __init__(self, path: str):
+    def __init__(self, path: str, job_synchronous: str = "FULL"):
         self.path = path
+        # PRAGMA synchronous for job commits. Jobs share runtime.db (rollback
+        # journal) with message history, so anything below FULL risks the
+        # whole file on power loss, not just job rows: opt-in only.
+        self.job_synchronous = job_synchronous
         self._lock = threading.Lock()
         self._init()
 
-    def _connect(self) -> sqlite3.Connection:
+    def _connect(self, synchronous: Optional[str] = None) -> sqlite3.Connection:
         conn = sqlite3.connect(self.path, check_same_thread=False)
         conn.row_factory = sqlite3.Row
         # Disable mmap to prevent Bus errors in multiprocess environment
@@ -33,6 +38,8 @@ class DB:
         conn.execute("PRAGMA busy_timeout=5000;")
         # Use DELETE journal mode instead of WAL to avoid .shm mmap issues with fork()
         conn.execute("PRAGMA journal_mode=DELETE;")
+        if synchronous:
+            conn.execute(f"PRAGMA synchronous={synchronous};")
         return conn
 
     def _init(self) -> None:
@@ -271,6 +278,11 @@ class DB:
                 cur.execute("ALTER TABLE scheduled_jobs ADD COLUMN files_dir TEXT")
             except Exception:
                 pass
+            # Migration: prompt with its context block rendered in (NULL = render on next run)
+            try:
+                cur.execute("ALTER TABLE scheduled_jobs ADD COLUMN rendered_prompt TEXT")
+            except Exception:
+                pass
             cur.execute("""
               CREATE TABLE IF NOT EXISTS scheduled_job_runs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -468,8 +480,6 @@ class DB:
         Returns:
             List of messages in OpenAI format
         """
-        import json
-
         query = "SELECT id, role, content, tool_calls, tool_call_id, thinking, thinking_signature, internal FROM messages WHERE conversation_id=?"
         if only_visible:
             query += " AND internal = 0"
@@ -669,8 +679,6 @@ class DB:
         Returns:
             List of tool calls with compressed arguments
         """
-        import json as json_mod
-
         compressed = []
         for tc in tool_calls:
             func = tc.get("function", {})
@@ -678,8 +686,8 @@ class DB:
             args_str = func.get("arguments", "{}")
 
             try:
-                args = json_mod.loads(args_str)
-            except json_mod.JSONDecodeError:
+                args = json.loads(args_str)
+            except json.JSONDecodeError:
                 compressed.append(tc)
                 continue
 
@@ -718,7 +726,7 @@ class DB:
 
             compressed.append({
                 **tc,
-                "function": {**func, "arguments": json_mod.dumps(args)}
+                "function": {**func, "arguments": json.dumps(args)}
             })
 
         return compressed
@@ -757,8 +765,6 @@ class DB:
 
     def save_message_from_dict(self, conversation_id: str, msg: Dict[str, Any], metadata: Optional[Dict] = None) -> None:
         """Save an OpenAI-format message dict to the database."""
-        import json
-
         role = msg.get("role")
         content = msg.get("content")
         tool_calls = msg.get("tool_calls")
@@ -802,7 +808,6 @@ class DB:
 
     def get_active_skills(self, conversation_id: str) -> Dict[str, int]:
         """Get active skills with TTL for a conversation."""
-        import json
         row = self.fetchone(
             "SELECT active_skills FROM agent_context WHERE conversation_id=?",
             (conversation_id,)
@@ -816,7 +821,6 @@ class DB:
 
     def save_active_skills(self, conversation_id: str, active_skills: Dict[str, int]) -> None:
         """Save active skills with TTL for a conversation (upsert)."""
-        import json
         skills_json = json.dumps(active_skills)
         self.execute(
             """
@@ -1002,32 +1006,38 @@ class DB:
     # --- Job Methods ---
 
     def save_job(self, job: "Job") -> None:
-        """Save or update a job in SQLite."""
-        self.execute(
-            """
-            INSERT INTO jobs(id, conversation_id, message, status, created_at, started_at, completed_at, result, error, worker_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                status = excluded.status,
-                started_at = excluded.started_at,
-                completed_at = excluded.completed_at,
-                result = excluded.result,
-                error = excluded.error,
-                worker_id = excluded.worker_id
-            """,
-            (
-                job.id,
-                job.conversation_id,
-                job.message,
-                job.status,
-                job.created_at.isoformat() if job.created_at else None,
-                job.started_at.isoformat() if job.started_at else None,
-                job.completed_at.isoformat() if job.completed_at else None,
-                job.result,
-                job.error,
-                job.worker_id
-            )
-        )
+        """Save or update a job in SQLite (single UPSERT, no pre-read)."""
+        with self._lock:
+            conn = self._connect(synchronous=self.job_synchronous)
+            try:
+                conn.execute(
+                    """
+                    INSERT INTO jobs(id, conversation_id, message, status, created_at, started_at, completed_at, result, error, worker_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        status = excluded.status,
+                        started_at = excluded.started_at,
+                        completed_at = excluded.completed_at,
+                        result = excluded.result,
+                        error = excluded.error,
+                        worker_id = excluded.worker_id
+                    """,
+                    (
+                        job.id,
+                        job.conversation_id,
+                        job.message,
+                        job.status,
+                        job.created_at.isoformat() if job.created_at else None,
+                        job.started_at.isoformat() if job.started_at else None,
+                        job.completed_at.isoformat() if job.completed_at else None,
+                        job.result,
+                        job.error,
+                        job.worker_id
+                    )
+                )
+                conn.commit()
+            finally:
+                conn.close()
 
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get a job by ID from SQLite."""
@@ -1174,8 +1184,8 @@ class DB:
             INSERT INTO scheduled_jobs(
                 id, conversation_id, name, prompt, cron_expression, schedule_description,
                 timezone, is_enabled, created_at, updated_at, last_run_at, next_run_at, run_count,
-                source_conversation_id, context_json, files_dir
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                source_conversation_id, context_json, files_dir, rendered_prompt
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(id) DO UPDATE SET
                 name = excluded.name,
                 prompt = excluded.prompt,
@@ -1189,7 +1199,8 @@ class DB:
                 run_count = excluded.run_count,
                 source_conversation_id = excluded.source_conversation_id,
                 context_json = excluded.context_json,
-                files_dir = excluded.files_dir
+                files_dir = excluded.files_dir,
+                rendered_prompt = excluded.rendered_prompt
             """,
             (
                 job_data["id"],
@@ -1207,7 +1218,8 @@ class DB:
                 job_data.get("run_count", 0),
                 job_data.get("source_conversation_id"),
                 job_data.get("context_json"),
-                job_data.get("files_dir")
+                job_data.get("files_dir"),
+                job_data.get("rendered_prompt")
             )
         )
 
@@ -1234,6 +1246,8 @@ class DB:
             row["is_enabled"] = True
         return rows
 
+    _PROMPT_INPUTS = frozenset(("prompt", "context_json", "files_dir"))
+
     def update_scheduled_job(self, job_id: str, updates: Dict[str, Any]) -> None:
         """Update specific fields of a scheduled job."""
         if not updates:
@@ -1250,6 +1264,10 @@ class DB:
                 set_clauses.append(f"{key} = ?")
                 params.append(value)
 
+        # Prompt inputs changed: drop the rendered prompt, next run re-renders it
+        if self._PROMPT_INPUTS.intersection(updates) and "rendered_prompt" not in updates:
+            set_clauses.append("rendered_prompt = NULL")
+
         # Always update updated_at
         set_clauses.append("updated_at = ?")
         params.append(self.now())
@@ -1284,6 +1302,79 @@ class DB:
             conn.close()
             return run_id
 
+    def trigger_job_txn(
+        self,
+        scheduled_job_id: str,
+        conversation_id: str,
+        job_id: str,
+        prompt: str,
+        next_run_at: Optional[str],
+        rendered_prompt: Optional[str] = None,
+        rendered_from: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Record a scheduled job firing in one transaction.
+
+        Creates the run's conversation with its user message, bumps the
+        scheduled job's stats and logs a pending scheduled_job_runs row.
+        rendered_prompt, if given, is stored for later runs, but only while
+        the job has none and its prompt inputs still match rendered_from
+        (the row it was rendered from): an edit saved in the meantime
+        cleared it, and the stale render must not come back.
+        Returns the run id.
+        """
+        now = self.now()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    """
+                    INSERT INTO conversations(id, created_at, scheduler_id, is_scheduler_run)
+                    VALUES (?, ?, ?, 1)
+                    """,
+                    (conversation_id, now, scheduled_job_id)
+                )
+                conn.execute(
+                    """
+                    INSERT INTO messages(conversation_id, role, content, internal, created_at)
+                    VALUES (?, 'user', ?, 0, ?)
+                    """,
+                    (conversation_id, prompt, now)
+                )
+                conn.execute(
+                    """
+                    UPDATE scheduled_jobs
+                    SET last_run_at = ?, next_run_at = ?, run_count = COALESCE(run_count, 0) + 1, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (now, next_run_at, now, scheduled_job_id)
+                )
+                if rendered_prompt is not None and rendered_from is not None:
+                    conn.execute(
+                        """
+                        UPDATE scheduled_jobs SET rendered_prompt = ?
+                        WHERE id = ? AND rendered_prompt IS NULL
+                          AND prompt IS ? AND context_json IS ? AND files_dir IS ?
+                        """,
+                        (rendered_prompt, scheduled_job_id, rendered_from["prompt"],
+                         rendered_from.get("context_json"), rendered_from.get("files_dir"))
+                    )
+                cur = conn.execute(
+                    """
+                    INSERT INTO scheduled_job_runs(scheduled_job_id, job_id, started_at, status)
+                    VALUES (?, ?, ?, 'pending')
+                    """,
+                    (scheduled_job_id, job_id, now)
+                )
+                run_id = cur.lastrowid
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+            return run_id
+
     def update_scheduled_job_run(self, run_id: int, status: str, result_preview: str = None) -> None:
         """Update a scheduled job run (e.g., when completed)."""
         self.execute(
@@ -1640,7 +1731,6 @@ class DB:
 
     def save_suggestions_to_last_assistant_message(self, conversation_id: str, suggestions: list) -> None:
         """Save follow-up suggestions to the last assistant message's metadata."""
-        import json
         row = self.fetchone(
             "SELECT id, metadata FROM messages WHERE conversation_id = ? AND role = 'assistant' AND internal = 0 ORDER BY id DESC LIMIT 1",
             (conversation_id,)
@@ -16,12 +16,30 @@ SKILLS_DIR = Path(settings.skills_dir)
 _APP_ROOT = str(Path(settings.skills_dir).parent.parent)
 
 
+# Allowed-skills scan memoized by skills/ directory mtime (changes on install/remove).
+# Subdirectories without a SKILL.md yet are re-checked on every call: skills are
+# created with mkdir first and SKILL.md written later, which doesn't touch skills/.
+_allowed_skills_cache: Dict[str, Any] = {"mtime": None, "result": frozenset(), "pending": ()}
+
+
 def get_allowed_skills() -> Set[str]:
-    """Dynamiczny whitelist - skanuje katalog skills/"""
-    return {
-        d.name for d in SKILLS_DIR.iterdir()
-        if d.is_dir() and (d / "SKILL.md").exists()
-    } - SKILL_BLACKLIST
+    """Dynamiczny whitelist - skanuje katalog skills/ (cache wg mtime katalogu)"""
+    mtime = SKILLS_DIR.stat().st_mtime_ns
+    if mtime == _allowed_skills_cache["mtime"] and not any(
+        (d / "SKILL.md").exists() for d in _allowed_skills_cache["pending"]
+    ):
+        return _allowed_skills_cache["result"]
+    found, pending = set(), []
+    for d in SKILLS_DIR.iterdir():
+        if not d.is_dir():
+            continue
+        if (d / "SKILL.md").exists():
+            found.add(d.name)
+        else:
+            pending.append(d)
+    result = frozenset(found) - SKILL_BLACKLIST
+    _allowed_skills_cache.update(mtime=mtime, result=result, pending=tuple(pending))
+    return result
 
 
 def list_skills() -> List[Dict[str, Any]]:
@@ -50,7 +68,7 @@ def list_skills() -> List[Dict[str, Any]]:
         # List available scripts
         scripts = []
         if scripts_dir.exists():
-            scripts = [f.stem for f in scripts_dir.glob("*.py") if f.is_file()]
+            scripts = [f.stem for f in scripts_dir.glob("*.py") if f.is_file() and not f.name.startswith("_")]
 
         result.append({
             "name": skill_name,
@@ -106,7 +124,7 @@ def execute_skill(
     # 5. Trackuj usage (automatycznie dedukcja z balance)
     track_skill_usage(
         tool_name="shell",
-        args={"cmd": " ".join(cmd)},
+        args={"script": script_path.name, "args": args},
         output=output,
         job_id=None,
         conversation_id=None,
@@ -6,6 +6,7 @@ import time
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
+from user_container.jobs.job import Job
 from user_container.logger import log
 
 
@@ -23,8 +24,11 @@ class JobQueue:
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         # Threading events for ask_user wake-up (agent runs in thread)
         self._sync_events: Dict[str, threading.Event] = {}
-        # In-memory job cache for fast access (avoids DB round-trips for hot data)
+        # In-memory job cache for fast access (avoids DB round-trips for hot data).
+        # Agent threads and the event loop both touch it, so every read-modify-write
+        # goes through _cache_lock.
         self._job_cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
         # Suggestions cache (in-memory, short-lived)
         self._suggestions: Dict[str, list] = {}
 
@@ -83,10 +87,10 @@ class JobQueue:
             "ask_user_default": ask_user_default,
             "suggestions": None,
         }
-        self._job_cache[job_id] = job_data
+        with self._cache_lock:
+            self._job_cache[job_id] = job_data
 
         # Persist to SQLite
-        from user_container.jobs.job import Job
         job = Job(
             id=job_id,
             conversation_id=conversation_id,
@@ -98,13 +102,13 @@ class JobQueue:
 
     def set_status(self, job_id: str, status: str = None, **kwargs):
         """Update job status and optional fields."""
-        cache = self._job_cache.get(job_id, {})
-        if status:
-            cache["status"] = status
-        for key, value in kwargs.items():
-            if value is not None:
-                cache[key] = value
-        self._job_cache[job_id] = cache
+        with self._cache_lock:
+            cache = self._job_cache.setdefault(job_id, {})
+            if status:
+                cache["status"] = status
+            for key, value in kwargs.items():
+                if value is not None:
+                    cache[key] = value
 
         # Persist important state changes to SQLite
         if status in ("running", "completed", "failed", "cancelled"):
@@ -112,23 +116,22 @@ class JobQueue:
 
     def _persist_job(self, job_id: str):
         """Persist job state from cache to SQLite."""
-        cache = self._job_cache.get(job_id)
-        if not cache:
-            return
-
-        from user_container.jobs.job import Job
-        job = Job(
-            id=cache["id"],
-            conversation_id=cache["conversation_id"],
-            message=cache["message"],
-            status=cache["status"],
-            created_at=datetime.fromisoformat(cache["created_at"]) if cache.get("created_at") else datetime.utcnow(),
-            started_at=datetime.fromisoformat(cache["started_at"]) if cache.get("started_at") else None,
-            completed_at=datetime.fromisoformat(cache["completed_at"]) if cache.get("completed_at") else None,
-            result=cache.get("result"),
-            error=cache.get("error"),
-            worker_id=cache.get("worker_id"),
-        )
+        with self._cache_lock:
+            cache = self._job_cache.get(job_id)
+            if not cache:
+                return
+            job = Job(
+                id=cache["id"],
+                conversation_id=cache["conversation_id"],
+                message=cache["message"],
+                status=cache["status"],
+                created_at=datetime.fromisoformat(cache["created_at"]) if cache.get("created_at") else datetime.utcnow(),
+                started_at=datetime.fromisoformat(cache["started_at"]) if cache.get("started_at") else None,
+                completed_at=datetime.fromisoformat(cache["completed_at"]) if cache.get("completed_at") else None,
+                result=cache.get("result"),
+                error=cache.get("error"),
+                worker_id=cache.get("worker_id"),
+            )
         try:
             self.db.save_job(job)
         except Exception as e:
@@ -136,8 +139,9 @@ class JobQueue:
 
     def get_job(self, job_id: str) -> Optional[dict]:
         """Get job data (cache first, then SQLite fallback)."""
-        if job_id in self._job_cache:
-            return self._job_cache[job_id]
+        cached = self._job_cache.get(job_id)
+        if cached is not None:
+            return cached
         # Fallback to SQLite for completed jobs
         return self.db.get_job(job_id)
 
@@ -152,12 +156,13 @@ class JobQueue:
 
     def set_question(self, job_id: str, question: str, options: list = None):
         """Set question for ask_user and update status to waiting_for_input."""
-        cache = self._job_cache.get(job_id, {})
-        cache["status"] = "waiting_for_input"
-        cache["question"] = question
-        cache["question_options"] = json.dumps(options) if options else None
-        cache["user_response"] = None
-        self._job_cache[job_id] = cache
+        question_options = json.dumps(options) if options else None
+        with self._cache_lock:
+            cache = self._job_cache.setdefault(job_id, {})
+            cache["status"] = "waiting_for_input"
+            cache["question"] = question
+            cache["question_options"] = question_options
+            cache["user_response"] = None
         # Create threading event for sync wait
         self._sync_events[job_id] = threading.Event()
 
@@ -176,10 +181,10 @@ class JobQueue:
 
     def set_response(self, job_id: str, response: str):
         """Set user response and wake up waiting agent."""
-        cache = self._job_cache.get(job_id, {})
-        cache["user_response"] = response
-        cache["status"] = "running"
-        self._job_cache[job_id] = cache
+        with self._cache_lock:
+            cache = self._job_cache.setdefault(job_id, {})
+            cache["user_response"] = response
+            cache["status"] = "running"
         # Wake up the agent thread
         event = self._sync_events.get(job_id)
         if event:
@@ -189,9 +194,8 @@ class JobQueue:
 
     def cancel(self, job_id: str):
         """Mark job as cancelled."""
-        cache = self._job_cache.get(job_id, {})
-        cache["is_cancelled"] = True
-        self._job_cache[job_id] = cache
+        with self._cache_lock:
+            self._job_cache.setdefault(job_id, {})["is_cancelled"] = True
 
     def is_cancelled(self, job_id: str) -> bool:
         """Check if job has been cancelled."""
@@ -202,9 +206,8 @@ class JobQueue:
 
     def force_respond(self, job_id: str):
         """Set force_respond flag - agent will stop tools and respond to user."""
-        cache = self._job_cache.get(job_id, {})
-        cache["is_force_respond"] = True
-        self._job_cache[job_id] = cache
+        with self._cache_lock:
+            self._job_cache.setdefault(job_id, {})["is_force_respond"] = True
 
     def is_force_respond(self, job_id: str) -> bool:
         """Check if force_respond flag is set."""
@@ -213,9 +216,8 @@ class JobQueue:
 
     def clear_force_respond(self, job_id: str):
         """Clear force_respond flag after it's been processed."""
-        cache = self._job_cache.get(job_id, {})
-        cache["is_force_respond"] = False
-        self._job_cache[job_id] = cache
+        with self._cache_lock:
+            self._job_cache.setdefault(job_id, {})["is_force_respond"] = False
 
     # --- Suggestions ---
 
@@ -232,7 +234,7 @@ class JobQueue:
     def get_active_job_for_conversation(self, conversation_id: str) -> Optional[dict]:
         """Find active job for a conversation."""
         active_statuses = {"pending", "running", "waiting_for_input"}
-        for job_data in self._job_cache.values():
+        for job_data in self.get_cached_jobs():
             if (job_data.get("conversation_id") == conversation_id and
                     job_data.get("status") in active_statuses):
                 return job_data
@@ -241,15 +243,21 @@ class JobQueue:
     def get_active_jobs_count(self) -> int:
         """Get count of currently running jobs."""
         return sum(
-            1 for j in self._job_cache.values()
+            1 for j in self.get_cached_jobs()
             if j.get("status") == "running"
         )
 
+    def get_cached_jobs(self) -> List[dict]:
+        """Snapshot of in-memory jobs, safe to iterate while workers update the cache."""
+        with self._cache_lock:
+            return list(self._job_cache.values())
+
     # --- Cleanup ---
 
     def cleanup_job(self, job_id: str):
         """Remove job from in-memory cache (after completion + persistence)."""
-        self._job_cache.pop(job_id, None)
+        with self._cache_lock:
+            self._job_cache.pop(job_id, None)
         self._sync_events.pop(job_id, None)
         self._suggestions.pop(job_id, None)
 
@@ -3,18 +3,134 @@ Rich-based logging for the agent module.
 Provides clean, colorful output for agent execution.
 """
 
+import atexit
 import json
-from typing import Any, Dict, List, Optional
+import os
+import sys
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 from rich.console import Console
 from rich.panel import Panel
+from rich.segment import Segment, Segments
 from rich.syntax import Syntax
 from rich.text import Text
 from rich.table import Table
 
 from user_container.config import settings
 
-console = Console()
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class _DeferredFlushStream:
+    """Proxy for a piped stdout that ignores Rich's per-print flush().
+
+    Rich flushes after every print, which turns each log line into a
+    write(2). When stdout is not a terminal, batch the writes instead: they
+    are flushed explicitly via flush_logs(), and at the latest `max_delay`
+    seconds after the first unflushed write, so scheduler and server lines
+    logged between agent steps still show up promptly.
+    """
+
+    def __init__(self, stream, max_delay: float = 1.0):
+        self._stream = stream
+        self._max_delay = max_delay
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        written = self._stream.write(text)
+        if self._timer is None:
+            with self._lock:
+                if self._timer is None:
+                    self._timer = threading.Timer(self._max_delay, self.flush_now)
+                    self._timer.daemon = True
+                    self._timer.start()
+        return written
+
+    def flush(self) -> None:
+        pass
+
+    def flush_now(self) -> None:
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+# Buffer only for piped/redirected output; PYTHONUNBUFFERED (set in Docker) opts out
+_buffered_stdout: Optional[_DeferredFlushStream] = None
+if not sys.stdout.isatty() and not os.getenv("PYTHONUNBUFFERED"):
+    _buffered_stdout = _DeferredFlushStream(sys.stdout)
+    atexit.register(_buffered_stdout.flush_now)
+
+console = Console(file=_buffered_stdout) if _buffered_stdout else Console()
+
+
+def flush_logs() -> None:
+    """Flush buffered console output (end of agent step / trace)."""
+    if _buffered_stdout is not None:
+        _buffered_stdout.flush_now()
+
+
+# LOG_LEVEL is fixed for the process lifetime, so resolve the debug flag once.
+# Callers that build expensive arguments should guard with `if is_debug():`
+# (like logging.isEnabledFor(DEBUG)) so the work is skipped entirely.
+DEBUG: bool = settings.debug
+
+
+def is_debug() -> bool:
+    """Return True when debug-only loggers will actually print."""
+    return DEBUG
+
+
+if orjson is not None:
+    def _json_pretty(obj: Any) -> str:
+        """Indented JSON for display (orjson, non-ASCII kept as-is)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    _json_loads = orjson.loads
+else:
+    def _json_pretty(obj: Any) -> str:
+        """Indented JSON for display (stdlib fallback)."""
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    _json_loads = json.loads
+
+
+def middle_truncate(text: str, budget: int) -> str:
+    """
+    Shorten text to about `budget` chars, keeping both head and tail.
+
+    Errors and final values usually sit at the end of tool output, so the
+    middle is dropped instead and replaced with a marker counting the
+    omitted characters. Python str slicing never splits a code point.
+    """
+    if len(text) <= budget:
+        return text
+    head = budget // 2
+    tail = budget - head
+    return f"{text[:head]} …[{len(text) - budget} chars omitted]… {text[-tail:]}"
+
+
+@lru_cache(maxsize=256)
+def _render_json_syntax(text: str, width: int) -> Tuple[Segment, ...]:
+    """Render JSON through the Pygments-backed Syntax highlighter once per payload."""
+    syntax = Syntax(text, "json", theme="monokai", padding=1, word_wrap=True)
+    return tuple(console.render(syntax, console.options.update_width(width)))
+
+
+def _print_json_syntax(text: str):
+    """Print highlighted JSON, reusing cached segments for repeated payloads."""
+    console.print(Segments(_render_json_syntax(text, console.width)))
 
 
 def log_user_message(content: str):
@@ -37,34 +153,40 @@ def log_agent_start(conversation_id: str, active_skills: Dict[str, int]):
 
 def log_step(step: int, max_steps: int):
     """Log step number."""
-    if settings.debug:
+    if DEBUG:
         console.print(f"[dim]Step {step}/{max_steps}[/dim]")
 
 
+_SKILL_TEMPLATES = {
+    "add": "  [green]+ skill:[/green] [bold]{}[/bold] [dim](TTL={})[/dim]",
+    "drop": "  [red]- skill:[/red] [bold]{}[/bold] [dim](dropped)[/dim]",
+    "expire": "  [yellow]⏱ skill:[/yellow] [bold]{}[/bold] [dim](expired)[/dim]",
+}
+_TOOL_CALL_TEMPLATE = "  [yellow]▶ {}[/yellow]"
+
+
 def log_skills_change(action: str, skill: str, ttl: Optional[int] = None):
     """Log skill changes (add/drop/expire)."""
-    if action == "add":
-        console.print(f"  [green]+ skill:[/green] [bold]{skill}[/bold] [dim](TTL={ttl})[/dim]")
-    elif action == "drop":
-        console.print(f"  [red]- skill:[/red] [bold]{skill}[/bold] [dim](dropped)[/dim]")
-    elif action == "expire":
-        console.print(f"  [yellow]⏱ skill:[/yellow] [bold]{skill}[/bold] [dim](expired)[/dim]")
+    template = _SKILL_TEMPLATES.get(action)
+    if template:
+        console.print(template.format(skill, ttl))
 
 
 def log_tool_call(tool_name: str, args: Dict[str, Any]):
     """Log a tool call with formatted arguments."""
     console.print()
-    console.print(f"  [yellow]▶ {tool_name}[/yellow]")
+    console.print(_TOOL_CALL_TEMPLATE.format(tool_name))
 
     # Format args nicely
     if args:
         try:
-            args_json = json.dumps(args, indent=2, ensure_ascii=False)
+            args_json = _json_pretty(args)
             if len(args_json) > 500:
                 # Truncate long args
                 args_json = args_json[:500] + "\n    ... (truncated)"
-            console.print(Syntax(args_json, "json", theme="monokai", padding=1, word_wrap=True))
-        except:
+            _print_json_syntax(args_json)
+        except (TypeError, ValueError):
+            # Not JSON-serializable (e.g. bytes or custom objects)
             console.print(f"    [dim]{args}[/dim]")
 
 
@@ -73,17 +195,22 @@ def log_tool_result(tool_name: str, result: str, is_error: bool = False):
     style = "red" if is_error else "green"
     icon = "✗" if is_error else "✓"
 
-    # Parse and format if JSON
-    try:
-        result_obj = json.loads(result)
-        result_formatted = json.dumps(result_obj, indent=2, ensure_ascii=False)
-        if len(result_formatted) > 800:
-            result_formatted = result_formatted[:800] + "\n  ... (truncated)"
+    # Parse and format if JSON (objects/arrays only; anything else is plain text)
+    result_obj = None
+    if result[:1] in ("{", "["):
+        try:
+            result_obj = _json_loads(result)
+        except ValueError:
+            pass
+
+    if result_obj is not None:
+        result_formatted = _json_pretty(result_obj)
+        result_formatted = middle_truncate(result_formatted, 800)
         console.print(f"  [{style}]{icon}[/{style}] [dim]result:[/dim]")
-        console.print(Syntax(result_formatted, "json", theme="monokai", padding=1, word_wrap=True))
-    except:
+        _print_json_syntax(result_formatted)
+    else:
         # Not JSON, show as text
-        result_short = result[:500] + "..." if len(result) > 500 else result
+        result_short = middle_truncate(result, 500)
         console.print(f"  [{style}]{icon}[/{style}] [dim]{result_short}[/dim]")
 
 
@@ -100,31 +227,33 @@ def log_assistant_response(content: str):
 
 def log_thinking(content: str):
     """Log thinking (only in debug mode)."""
-    if settings.debug and content:
-        console.print()
-        console.print(Panel(
-            content,
-            title="[bold magenta]Thinking[/bold magenta]",
-            border_style="magenta",
-            padding=(0, 1)
-        ))
+    if not DEBUG or not content:
+        return
+    console.print()
+    console.print(Panel(
+        content,
+        title="[bold magenta]Thinking[/bold magenta]",
+        border_style="magenta",
+        padding=(0, 1)
+    ))
 
 
 def log_error(message: str):
     """Log error message."""
     console.print(f"[bold red]Error:[/bold red] {message}")
+    flush_logs()
 
 
 def log_debug(message: str):
     """Log debug message (only in debug mode)."""
-    if settings.debug:
+    if DEBUG:
         console.print(f"[dim]{message}[/dim]")
 
 
 # Legacy compatibility - old _log calls route here
 def log(msg: str, debug_only: bool = False):
     """Legacy log function for backwards compatibility."""
-    if debug_only and not settings.debug:
+    if debug_only and not DEBUG:
         return
 
     # Parse old-style messages and route to appropriate new functions
@@ -156,22 +285,33 @@ def log(msg: str, debug_only: bool = False):
         console.print(msg)
 
 
-def log_llm_request(messages: List[Dict[str, Any]], component: str = "Agent"):
+def log_llm_request(
+    messages: List[Dict[str, Any]],
+    component: str = "Agent",
+    last_assistant_idx: Optional[int] = None,
+):
     """Log LLM request summary (only in debug mode).
 
     Shows only NEW messages since last assistant response to avoid repetition.
     Full details are logged separately by log_tool_call, log_tool_result, etc.
+
+    Callers that append to `messages` themselves can pass `last_assistant_idx`
+    (-1 if there is none yet); otherwise it is found while counting roles.
     """
-    if not settings.debug:
+    if not DEBUG:
         return
 
-    # Find messages since last assistant response (these are the "new" ones)
-    # Work backwards to find last assistant message
-    last_assistant_idx = -1
-    for i in range(len(messages) - 1, -1, -1):
-        if messages[i].get("role") == "assistant":
+    # Count by role for summary, locating the last assistant message in the
+    # same pass when the caller did not track it
+    role_counts = {}
+    scan_for_assistant = last_assistant_idx is None
+    if scan_for_assistant:
+        last_assistant_idx = -1
+    for i, msg in enumerate(messages):
+        role = msg.get("role", "unknown")
+        role_counts[role] = role_counts.get(role, 0) + 1
+        if scan_for_assistant and role == "assistant":
             last_assistant_idx = i
-            break
 
     # New messages = everything after last assistant (tool results going back)
     # If no assistant yet, show last user message
@@ -181,12 +321,6 @@ def log_llm_request(messages: List[Dict[str, Any]], component: str = "Agent"):
         # First call - find user message(s)
         new_messages = [m for m in messages if m.get("role") == "user"][-1:] if messages else []
 
-    # Count by role for summary
-    role_counts = {}
-    for msg in messages:
-        role = msg.get("role", "unknown")
-        role_counts[role] = role_counts.get(role, 0) + 1
-
     counts_str = ", ".join(f"{r}:{c}" for r, c in role_counts.items())
 
     console.print()
@@ -201,26 +335,35 @@ def log_llm_request(messages: List[Dict[str, Any]], component: str = "Agent"):
         console.print(f"[dim]No new messages (continuing conversation)[/dim]")
 
 
-def _log_single_message(msg: Dict[str, Any]):
-    """Helper to log a single message."""
-    role = msg.get("role", "unknown")
-    content = msg.get("content", "")
+# Role-colored markup prefixes, built once
+_ROLE_PREFIX = {
+    "system": "  [magenta]system:[/magenta] ",
+    "user": "  [blue]user:[/blue] ",
+    "assistant": "  [green]assistant:[/green] ",
+    "tool": "  [yellow]tool:[/yellow] ",
+}
+
 
-    # Color by role
-    role_colors = {
-        "system": "magenta",
-        "user": "blue",
-        "assistant": "green",
-        "tool": "yellow",
-    }
-    role_color = role_colors.get(role, "white")
+def _format_message_preview(role: str, content: Any) -> str:
+    """Build the truncated, role-colored markup line for a message."""
+    prefix = _ROLE_PREFIX.get(role) or f"  [white]{role}:[/white] "
 
     # Truncate content for display
     max_len = 300 if role == "tool" else 500
-    if content and len(content) > max_len:
+    if content and isinstance(content, str):
+        content = middle_truncate(content, max_len)
+    elif content and len(content) > max_len:
         content = content[:max_len] + "..."
 
-    console.print(f"  [{role_color}]{role}:[/{role_color}] {content if content else '[empty]'}")
+    return f"{prefix}{content if content else '[empty]'}"
+
+
+def _log_single_message(msg: Dict[str, Any]):
+    """Helper to log a single message."""
+    role = msg.get("role", "unknown")
+    content = msg.get("content", "")
+
+    console.print(_format_message_preview(role, content))
 
     # Show tool_call_id for tool messages
     if msg.get("tool_call_id"):
@@ -238,7 +381,7 @@ def _log_single_message(msg: Dict[str, Any]):
 
 def log_llm_response(content: Optional[str], tool_calls: Optional[List] = None, component: str = "Agent"):
     """Log LLM response (only in debug mode)."""
-    if not settings.debug:
+    if not DEBUG:
         return
 
     console.print()
@@ -261,9 +404,9 @@ def log_llm_response(content: Optional[str], tool_calls: Optional[List] = None,
 
             # Pretty print args
             try:
-                args_obj = json.loads(args)
-                args_display = json.dumps(args_obj, indent=2)[:200]
-            except:
+                args_obj = _json_loads(args)
+                args_display = _json_pretty(args_obj)[:200]
+            except (TypeError, ValueError):
                 args_display = args[:200]
 
             console.print(f"  [yellow]→ {name}[/yellow]({args_display}{'...' if len(args) > 200 else ''})")
@@ -4,10 +4,59 @@ Helper functions for logging to Langfuse.
 Provides convenient functions to log LLM generations and tool spans.
 """
 
-from typing import Any, Dict, List, Optional
+import json
+from typing import Any, Callable, Dict, List, Optional
 
 from user_container.observability.trace_context import get_current_trace, create_span
-from user_container.logger import log_debug, log_error
+from user_container.logger import is_debug, log_debug, log_error, middle_truncate
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Per-message allowance for role/keys/punctuation when estimating payload size
+_MESSAGE_OVERHEAD = 50
+
+
+def _estimate_message_size(msg: Dict[str, Any]) -> int:
+    """Approximate serialized size of a message without stringifying the whole dict."""
+    content = msg.get("content")
+    if isinstance(content, str):
+        size = len(content)
+    elif content:
+        size = len(str(content))
+    else:
+        size = 0
+    tool_calls = msg.get("tool_calls")
+    if tool_calls:
+        size += len(str(tool_calls))
+    return size + _MESSAGE_OVERHEAD
+
+
+def _json_bytes(obj: Any) -> bytes:
+    """Serialize like the Langfuse exporter would, to size payloads by wire bytes."""
+    try:
+        if orjson is not None:
+            return orjson.dumps(obj, default=str)
+        return json.dumps(obj, default=str, ensure_ascii=False).encode()
+    except (TypeError, ValueError):
+        # e.g. non-string dict keys
+        return str(obj).encode()
+
+
+def _record_observation(start: Callable[..., Any], **kwargs: Any) -> None:
+    """
+    Create an observation and end it immediately.
+
+    Langfuse v3 is OpenTelemetry-based: a span is exported once, when it is
+    ended, and the SDK batches exports on its worker thread. There is no
+    separate one-shot API, so start+end here produce a single event. Flushing
+    is left to the batch processor (and flush_langfuse() at shutdown).
+    """
+    observation = start(**kwargs)
+    if observation:
+        observation.end()
 
 
 def log_generation(
@@ -37,57 +86,60 @@ def log_generation(
 
     try:
         # Truncate large input messages to prevent Langfuse payload bloat
+        # Single reverse walk: keep the last N messages that fit within the limit
         MAX_INPUT_SIZE = 50000
         input_to_log = input_messages
-        input_str = str(input_messages)
-        if len(input_str) > MAX_INPUT_SIZE:
-            # Keep last N messages that fit within limit
-            truncated = []
-            total_size = 0
-            for msg in reversed(input_messages):
-                msg_size = len(str(msg))
-                if total_size + msg_size > MAX_INPUT_SIZE:
-                    break
-                truncated.insert(0, msg)
-                total_size += msg_size
-            input_to_log = [{"role": "system", "content": f"[{len(input_messages) - len(truncated)} earlier messages truncated]"}] + truncated
-
-        # Build usage object for Langfuse
+        total_size = 0
+        for i in range(len(input_messages) - 1, -1, -1):
+            total_size += _estimate_message_size(input_messages[i])
+            if total_size > MAX_INPUT_SIZE:
+                kept = input_messages[i + 1:]
+                input_to_log = [{"role": "system", "content": f"[{i + 1} earlier messages truncated]"}] + kept
+                break
+
+        # Build usage object for Langfuse (only when there is something to report)
         langfuse_usage = None
         if usage:
-            langfuse_usage = {
-                "input": usage.get("prompt_tokens", 0),
-                "output": usage.get("completion_tokens", 0),
-                "total": usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0),
-            }
-            # Add cache info if present
-            if usage.get("cache_read_tokens"):
-                langfuse_usage["input_cached"] = usage["cache_read_tokens"]
-
-        # Build model parameters
-        model_params = {}
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+            cache_read_tokens = usage.get("cache_read_tokens")
+            if prompt_tokens or completion_tokens or cache_read_tokens:
+                langfuse_usage = {
+                    "input": prompt_tokens,
+                    "output": completion_tokens,
+                    "total": prompt_tokens + completion_tokens,
+                }
+                # Add cache info if present
+                if cache_read_tokens:
+                    langfuse_usage["input_cached"] = cache_read_tokens
+
+        # Build model parameters only if metadata carries any
+        model_params = None
         if metadata:
-            if metadata.get("thinking_budget"):
-                model_params["thinking_budget"] = metadata["thinking_budget"]
-            if metadata.get("tool_count"):
-                model_params["tool_count"] = metadata["tool_count"]
-
-        # Create generation (Langfuse v3 API)
-        generation = trace.start_observation(
+            thinking_budget = metadata.get("thinking_budget")
+            tool_count = metadata.get("tool_count")
+            if thinking_budget or tool_count:
+                model_params = {}
+                if thinking_budget:
+                    model_params["thinking_budget"] = thinking_budget
+                if tool_count:
+                    model_params["tool_count"] = tool_count
+
+        # Create and end generation in one step (Langfuse v3 API)
+        _record_observation(
+            trace.start_observation,
             as_type="generation",
             name=name,
             model=model,
             input=input_to_log,
-            output=output,
+            output=middle_truncate(output, MAX_INPUT_SIZE) if output else output,
             usage_details=langfuse_usage,
-            model_parameters=model_params if model_params else None,
-            metadata=metadata or {},
+            model_parameters=model_params,
+            metadata=metadata,
         )
-        # End generation immediately
-        if generation:
-            generation.end()
 
-        log_debug(f"[Langfuse] Logged generation: {name} (model={model}, cost=${cost_usd:.6f})" if cost_usd else f"[Langfuse] Logged generation: {name} (model={model})")
+        if is_debug():
+            log_debug(f"[Langfuse] Logged generation: {name} (model={model}, cost=${cost_usd:.6f})" if cost_usd else f"[Langfuse] Logged generation: {name} (model={model})")
     except Exception as e:
         log_error(f"[Langfuse] Failed to log generation: {e}")
 
@@ -117,14 +169,16 @@ def log_tool_span(
         # Truncate large results to avoid bloating Langfuse
         output = result
         if isinstance(result, str) and len(result) > 10000:
-            output = result[:10000] + "... [truncated]"
+            output = middle_truncate(result, 10000)
         elif isinstance(result, dict):
-            result_str = str(result)
-            if len(result_str) > 10000:
-                output = {"truncated": True, "preview": result_str[:10000]}
-
-        # Create span (Langfuse v3 API)
-        span = trace.start_span(
+            result_bytes = _json_bytes(result)
+            if len(result_bytes) > 10000:
+                preview = result_bytes.decode("utf-8", "replace")
+                output = {"truncated": True, "preview": middle_truncate(preview, 10000)}
+
+        # Create and end span in one step (tools are synchronous)
+        _record_observation(
+            trace.start_span,
             name=f"tool:{tool_name}",
             input=args,
             output=output,
@@ -132,10 +186,6 @@ def log_tool_span(
             metadata={"is_error": is_error},
         )
 
-        # End span immediately (tools are synchronous)
-        if span:
-            span.end()
-
         log_debug(f"[Langfuse] Logged tool span: {tool_name}" + (" (error)" if is_error else ""))
     except Exception as e:
         log_error(f"[Langfuse] Failed to log tool span: {e}")
@@ -12,9 +12,35 @@ from user_container.config import settings
 from user_container.logger import log_debug, log_error
 
 
-_langfuse_instance = None
+# Sentinel until the first get_langfuse() call resolves the client (or None)
+_UNSET = object()
+_langfuse_instance = _UNSET
 _langfuse_lock = threading.Lock()
-_init_attempted = False
+
+
+def _create_langfuse():
+    """Build the Langfuse client, or return None if unconfigured/unavailable."""
+    # Check if Langfuse is configured
+    if not settings.langfuse_public_key or not settings.langfuse_secret_key:
+        log_debug("[Langfuse] Not configured (missing keys), observability disabled")
+        return None
+
+    try:
+        from langfuse import Langfuse
+
+        instance = Langfuse(
+            public_key=settings.langfuse_public_key,
+            secret_key=settings.langfuse_secret_key,
+            host=settings.langfuse_host,
+        )
+        log_debug(f"[Langfuse] Initialized (host: {settings.langfuse_host})")
+        return instance
+    except ImportError:
+        log_debug("[Langfuse] Package not installed, observability disabled")
+        return None
+    except Exception as e:
+        log_error(f"[Langfuse] Failed to initialize: {e}")
+        return None
 
 
 def get_langfuse():
@@ -22,41 +48,20 @@ def get_langfuse():
     Get the Langfuse client singleton.
 
     Returns None if Langfuse is not configured (missing keys).
-    Thread-safe lazy initialization.
+    Thread-safe lazy initialization; after the first call this is a single
+    global read with no lock.
     """
-    global _langfuse_instance, _init_attempted
+    global _langfuse_instance
 
-    if _init_attempted:
-        return _langfuse_instance
+    instance = _langfuse_instance
+    if instance is not _UNSET:
+        return instance
 
     with _langfuse_lock:
         # Double-check after acquiring lock
-        if _init_attempted:
-            return _langfuse_instance
-
-        _init_attempted = True
-
-        # Check if Langfuse is configured
-        if not settings.langfuse_public_key or not settings.langfuse_secret_key:
-            log_debug("[Langfuse] Not configured (missing keys), observability disabled")
-            return None
-
-        try:
-            from langfuse import Langfuse
-
-            _langfuse_instance = Langfuse(
-                public_key=settings.langfuse_public_key,
-                secret_key=settings.langfuse_secret_key,
-                host=settings.langfuse_host,
-            )
-            log_debug(f"[Langfuse] Initialized (host: {settings.langfuse_host})")
-            return _langfuse_instance
-        except ImportError:
-            log_debug("[Langfuse] Package not installed, observability disabled")
-            return None
-        except Exception as e:
-            log_error(f"[Langfuse] Failed to initialize: {e}")
-            return None
+        if _langfuse_instance is _UNSET:
+            _langfuse_instance = _create_langfuse()
+        return _langfuse_instance
 
 
 def flush_langfuse():
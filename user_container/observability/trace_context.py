@@ -6,16 +6,22 @@ Uses Langfuse v3 API (start_span with TraceContext).
 """
 
 from contextvars import ContextVar
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from user_container.config import settings
 from user_container.observability.langfuse_client import get_langfuse
-from user_container.logger import log_debug, log_error
+from user_container.logger import log_debug, log_error, flush_logs
 
 
 # Context variables for current trace and span
 _current_trace: ContextVar[Optional[Any]] = ContextVar("current_trace", default=None)
 _current_span: ContextVar[Optional[Any]] = ContextVar("current_span", default=None)
 
+# Static tags from env (LANGFUSE_TAGS), parsed once
+_STATIC_TAGS: Tuple[str, ...] = tuple(
+    t.strip() for t in (settings.langfuse_tags or "").split(",") if t.strip()
+)
+
 
 def start_trace(
     name: str,
@@ -46,7 +52,6 @@ def start_trace(
     try:
         # Langfuse v3: create trace ID and use start_span with TraceContext
         from langfuse.types import TraceContext
-        from user_container.config import settings
 
         trace_id = langfuse.create_trace_id()
         trace_context = TraceContext(trace_id=trace_id)
@@ -59,12 +64,8 @@ def start_trace(
             metadata=metadata or {},
         )
 
-        # Build tags list
-        all_tags = []
-
-        # Static tags from env
-        if settings.langfuse_tags:
-            all_tags.extend([t.strip() for t in settings.langfuse_tags.split(",") if t.strip()])
+        # Build tags list: static tags from env, then dynamic ones
+        all_tags = list(_STATIC_TAGS)
 
         # Dynamic tags passed in
         if tags:
@@ -103,6 +104,7 @@ def end_trace(
         metadata: Additional metadata to merge
         tags: Additional tags to add at trace end
     """
+    flush_logs()
     trace = _current_trace.get()
     if not trace:
         return
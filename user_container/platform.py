@@ -20,10 +20,15 @@ def _detect_docker() -> bool:
     if os.path.exists("/.dockerenv"):
         return True
     try:
-        with open("/proc/1/cgroup", "r") as f:
-            return "docker" in f.read()
-    except (FileNotFoundError, PermissionError):
+        # cgroup entries are tiny: one raw read, no text-io layer
+        fd = os.open("/proc/1/cgroup", os.O_RDONLY)
+        try:
+            buf = os.read(fd, 4096)
+        finally:
+            os.close(fd)
+    except OSError:
         return False
+    return b"docker" in buf or b"kubepods" in buf
 
 
 def _detect_sandbox_user() -> bool:
@@ -53,6 +58,9 @@ IS_DOCKER = _detect_docker()
 HAS_SANDBOX_USER = _detect_sandbox_user()
 HAS_RESOURCE_LIMITS = _detect_resource_limits()
 
+# Resolved once: PATH lookup stats every directory and bash does not move at runtime
+_BASH = None if IS_WINDOWS else (shutil.which("bash") or "/bin/bash")
+
 
 def get_shell_command(script: str) -> list[str]:
     """Return the platform-appropriate command to run a shell script string.
@@ -62,9 +70,7 @@ def get_shell_command(script: str) -> list[str]:
     """
     if IS_WINDOWS:
         return ["powershell", "-Command", script]
-    # Prefer bash, fall back to sh
-    bash = shutil.which("bash") or "/bin/bash"
-    return [bash, "-c", script]
+    return [_BASH, "-c", script]
 
 
 def get_kill_signal():
@@ -75,8 +81,55 @@ def get_kill_signal():
     return signal.SIGTERM
 
 
+def _find_pids_on_port_linux(port: int) -> list[int]:
+    """Find PIDs listening on a port by scanning /proc (no lsof fork/exec).
+
+    Collects socket inodes in LISTEN state (0A) on the port from
+    /proc/net/tcp{,6}, then matches them against /proc/<pid>/fd links.
+    """
+    port_hex = f"{port:04X}"
+    inodes = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as f:
+                next(f, None)  # header
+                for line in f:
+                    fields = line.split()
+                    # fields: sl local_address rem_address st ... uid timeout inode
+                    if len(fields) > 9 and fields[3] == "0A" and fields[1].endswith(":" + port_hex):
+                        inodes.add(f"socket:[{fields[9]}]")
+        except OSError:
+            continue
+    if not inodes:
+        return []
+
+    pids = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        fd_dir = f"/proc/{entry.name}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue  # process exited or not ours
+        for fd in fds:
+            try:
+                if os.readlink(f"{fd_dir}/{fd}") in inodes:
+                    pids.append(int(entry.name))
+                    break
+            except OSError:
+                continue
+    return pids
+
+
 def find_pids_on_port(port: int) -> list[int]:
     """Find PIDs listening on a given port. Cross-platform."""
+    if IS_LINUX and os.path.isdir("/proc/net"):
+        try:
+            return _find_pids_on_port_linux(port)
+        except OSError:
+            pass  # fall back to lsof
+
     pids = []
     try:
         if IS_POSIX:
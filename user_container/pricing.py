@@ -3,20 +3,59 @@ Pricing module - calculates costs from LLM usage.
 """
 import json
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Set, Tuple
 
 from user_container.logger import log
 
-_PRICES: Optional[Dict] = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_DEFAULT_FALLBACK = {"input_per_million": 10.0, "output_per_million": 30.0}
+
+
+def _read_prices() -> Dict:
+    path = Path(__file__).parent / "costs.json"
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
+        return json.load(f)
+
+
+def _flatten_prices(prices_data: Dict) -> Dict[Tuple[str, str], Tuple[float, float, float, float]]:
+    """
+    Flatten costs.json into {(provider, model): (input, output, cache_write, cache_read)}.
+
+    Per-million prices with input/output fallback already applied and
+    cache prices 0.0 for models that have none.
+    """
+    fallback = prices_data.get("fallback", _DEFAULT_FALLBACK)
+    flat = {}
+    for provider, models in prices_data.get("prices", {}).items():
+        for model, model_prices in models.items():
+            if not isinstance(model_prices, dict) or not model_prices:
+                continue  # e.g. "_comment" entries
+            flat[(provider, model)] = (
+                model_prices.get("input_per_million", fallback["input_per_million"]),
+                model_prices.get("output_per_million", fallback["output_per_million"]),
+                model_prices.get("cache_write_per_million", 0.0),
+                model_prices.get("cache_read_per_million", 0.0),
+            )
+    return flat
+
+
+# Parsed once at import
+_PRICES: Dict = _read_prices()
+_FALLBACK: Dict = _PRICES.get("fallback", _DEFAULT_FALLBACK)
+_FLAT_PRICES = _flatten_prices(_PRICES)
+
+# Unknown models already reported, so the fallback warning is logged once each
+_warned_models: Set[Tuple[str, str]] = set()
 
 
 def load_prices() -> Dict:
-    """Load prices from costs.json (cached in memory)."""
-    global _PRICES
-    if _PRICES is None:
-        path = Path(__file__).parent / "costs.json"
-        with open(path) as f:
-            _PRICES = json.load(f)
+    """Return prices from costs.json (parsed once at import)."""
     return _PRICES
 
 
@@ -37,14 +76,10 @@ def calculate_cost(
     Returns:
         Cost in USD (float)
     """
-    prices_data = load_prices()
-    fallback = prices_data.get("fallback", {"input_per_million": 10.0, "output_per_million": 30.0})
-
     # Try to find model-specific pricing
-    provider_prices = prices_data.get("prices", {}).get(provider, {})
-    model_prices = provider_prices.get(model)
+    resolved = _FLAT_PRICES.get((provider, model))
 
-    if not model_prices:
+    if resolved is None:
         # Try LiteLLM's built-in cost calculator (covers 300+ models)
         try:
             import litellm
@@ -59,26 +94,20 @@ def calculate_cost(
                 return cost
         except Exception:
             pass
-        log(f"[Pricing] Unknown model {provider}/{model}, using fallback pricing")
-        model_prices = fallback
-
-    # Calculate base costs
-    prompt_tokens = usage.get("prompt_tokens", 0)
-    completion_tokens = usage.get("completion_tokens", 0)
-
-    input_cost = prompt_tokens * model_prices.get("input_per_million", fallback["input_per_million"]) / 1_000_000
-    output_cost = completion_tokens * model_prices.get("output_per_million", fallback["output_per_million"]) / 1_000_000
-
-    # Anthropic cache pricing (if applicable)
-    cache_write_cost = 0.0
-    cache_read_cost = 0.0
-    if "cache_write_per_million" in model_prices:
-        cache_creation = usage.get("cache_creation_tokens", 0)
-        cache_read = usage.get("cache_read_tokens", 0)
-        cache_write_cost = cache_creation * model_prices["cache_write_per_million"] / 1_000_000
-        cache_read_cost = cache_read * model_prices["cache_read_per_million"] / 1_000_000
-
-    total = input_cost + output_cost + cache_write_cost + cache_read_cost
+        if (provider, model) not in _warned_models:
+            _warned_models.add((provider, model))
+            log(f"[Pricing] Unknown model {provider}/{model}, using fallback pricing")
+        resolved = (_FALLBACK["input_per_million"], _FALLBACK["output_per_million"], 0.0, 0.0)
+
+    input_pm, output_pm, cache_write_pm, cache_read_pm = resolved
+
+    # Base costs plus Anthropic cache pricing (0.0 for models without it)
+    total = (
+        usage.get("prompt_tokens", 0) * input_pm
+        + usage.get("completion_tokens", 0) * output_pm
+        + usage.get("cache_creation_tokens", 0) * cache_write_pm
+        + usage.get("cache_read_tokens", 0) * cache_read_pm
+    ) / 1_000_000
     return total
 
 
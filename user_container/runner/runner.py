@@ -1,11 +1,38 @@
 import subprocess
 import os
+import signal
+import threading
+import time
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
 
+from user_container.config import settings
 from user_container.platform import IS_POSIX, IS_WINDOWS, HAS_SANDBOX_USER, HAS_RESOURCE_LIMITS
 
+# Only the tail of each stream is kept; earlier output is dropped as it is read
+OUTPUT_TAIL_BYTES = 20000
+OUTPUT_READ_CHUNK = 64 * 1024
+
+# Seconds between SIGTERM and SIGKILL when a command times out
+KILL_GRACE_S = 2.0
+
+
+def _resolve_sandbox_ids():
+    """Look up sandbox uid/gid once, so preexec_fn never does an NSS lookup after fork."""
+    if not HAS_SANDBOX_USER:
+        return None, None
+    try:
+        import pwd
+        pw = pwd.getpwnam('sandbox')
+        return pw.pw_uid, pw.pw_gid
+    except (KeyError, ImportError):
+        return None, None
+
+
+SANDBOX_UID, SANDBOX_GID = _resolve_sandbox_ids()
+# Switching uid needs root; elsewhere demotion is a silent no-op, as before
+CAN_DEMOTE = SANDBOX_UID is not None and os.geteuid() == 0
+
 
 def _demote_to_sandbox():
     """
@@ -13,61 +40,143 @@ def _demote_to_sandbox():
     This prevents user-generated code from accessing sensitive files like /app/secrets.json.
     No-op when sandbox user doesn't exist (native macOS/Windows).
     """
-    if not HAS_SANDBOX_USER:
+    if SANDBOX_UID is None:
         return
     try:
-        import pwd
-        pw = pwd.getpwnam('sandbox')
-        os.setgid(pw.pw_gid)
-        os.setuid(pw.pw_uid)
-    except (KeyError, OSError, PermissionError, ImportError):
+        os.setgid(SANDBOX_GID)
+        os.setuid(SANDBOX_UID)
+    except OSError:
         pass
 
 
-def _setup_process_limits(demote: bool = True):
-    """
-    Set resource limits for child processes to prevent DoS attacks.
-    Called via preexec_fn before subprocess execution.
-    No-op when resource module is unavailable (Windows).
+def _build_rlimits(demote: bool) -> tuple:
+    """(resource, (soft, hard)) pairs for a policy, computed once at import."""
+    if not HAS_RESOURCE_LIMITS:
+        return ()
+    import resource
 
-    Args:
-        demote: If True, switch to sandbox user (for user commands).
-                If False, stay as root (for skills that need secrets.json).
-    """
+    limits = []
+    # For user commands (demote=True): apply strict limits
+    # For skills (demote=False): skip memory limit (Chromium needs more)
     if demote:
-        _demote_to_sandbox()
+        # Max 2GB virtual memory per process
+        mem_limit = 2 * 1024 * 1024 * 1024
+        limits.append((resource.RLIMIT_AS, (mem_limit, mem_limit)))
 
-    if not HAS_RESOURCE_LIMITS:
+    # Max 500MB file size (allows large Python packages like pyarrow)
+    file_limit = 500 * 1024 * 1024
+    limits.append((resource.RLIMIT_FSIZE, (file_limit, file_limit)))
+
+    # Max 60 seconds CPU time, 300 child processes (skip for skills -
+    # browser ops take longer, and on macOS native NPROC counts all user
+    # processes which causes "os error 35" when user has 300+ procs)
+    if demote:
+        limits.append((resource.RLIMIT_NPROC, (300, 300)))
+        limits.append((resource.RLIMIT_CPU, (60, 60)))
+    return tuple(limits)
+
+
+_RLIMITS = {True: _build_rlimits(True), False: _build_rlimits(False)}
+_setrlimit = _prlimit = None
+if HAS_RESOURCE_LIMITS:
+    import resource as _resource
+    _setrlimit = _resource.setrlimit
+    _prlimit = getattr(_resource, "prlimit", None)  # Linux only
+
+
+def _apply_rlimits(demote: bool) -> None:
+    """Apply the resource limits for the given policy to the current process."""
+    for res, limit in _RLIMITS[demote]:
+        try:
+            _setrlimit(res, limit)
+        except (ValueError, OSError):
+            # Some limits may not be available on all systems
+            pass
+
+
+def _apply_rlimits_to(pid: int, demote: bool) -> None:
+    """Apply a policy's resource limits to a running child (no preexec_fn needed)."""
+    if _prlimit is None:
         return
+    for res, limit in _RLIMITS[demote]:
+        try:
+            _prlimit(pid, res, limit)
+        except (ValueError, OSError):
+            # Child already exited, or the limit isn't available here
+            pass
 
-    try:
-        import resource
-
-        # For user commands (demote=True): apply strict limits
-        # For skills (demote=False): skip memory limit (Chromium needs more)
-        if demote:
-            # Max 2GB virtual memory per process
-            mem_limit = 2 * 1024 * 1024 * 1024
-            resource.setrlimit(resource.RLIMIT_AS, (mem_limit, mem_limit))
-
-        # Max 500MB file size (allows large Python packages like pyarrow)
-        file_limit = 500 * 1024 * 1024
-        resource.setrlimit(resource.RLIMIT_FSIZE, (file_limit, file_limit))
-
-        # Max 60 seconds CPU time, 300 child processes (skip for skills -
-        # browser ops take longer, and on macOS native NPROC counts all user
-        # processes which causes "os error 35" when user has 300+ procs)
-        if demote:
-            resource.setrlimit(resource.RLIMIT_NPROC, (300, 300))
-            resource.setrlimit(resource.RLIMIT_CPU, (60, 60))
-    except (ValueError, OSError):
-        # Some limits may not be available on all systems
-        pass
+
+def _parse_cpu_list(spec: Optional[str]) -> Optional[frozenset]:
+    """
+    Parse RUNNER_CPUS ("0-3,6" or "half") into a CPU set.
+    Returns None (no pinning) when unset, invalid or unsupported.
+    """
+    if not spec or not hasattr(os, "sched_setaffinity"):
+        return None
+    available = os.sched_getaffinity(0)
+    if spec.strip().lower() == "half":
+        cpus = frozenset(sorted(available)[:max(1, len(available) // 2)])
+    else:
+        cpus = set()
+        try:
+            for part in spec.split(","):
+                lo, _, hi = part.strip().partition("-")
+                cpus.update(range(int(lo), int(hi or lo) + 1))
+        except ValueError:
+            return None
+        cpus = frozenset(cpus & available)
+    return cpus or None
+
+
+RUNNER_CPUS = _parse_cpu_list(settings.runner_cpus)
+
+
+def _iso_now() -> str:
+    """Current UTC time as ISO-8601 with a trailing Z, formatted from time_ns()."""
+    secs, ns = divmod(time.time_ns(), 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs)) + f".{ns // 1000:06d}Z"
 
 
-@dataclass
+class _TailReader(threading.Thread):
+    """Drain a pipe, keeping only its last OUTPUT_TAIL_BYTES in memory."""
+
+    def __init__(self, pipe):
+        super().__init__(daemon=True)
+        # Own the pipe: it is closed here, never under a still-reading thread
+        self._pipe = pipe
+        self._tail = bytearray()
+
+    def run(self) -> None:
+        fd = self._pipe.fileno()
+        tail = self._tail
+        try:
+            while True:
+                chunk = os.read(fd, OUTPUT_READ_CHUNK)
+                if not chunk:
+                    break
+                tail += chunk
+                if len(tail) > OUTPUT_TAIL_BYTES:
+                    del tail[:-OUTPUT_TAIL_BYTES]
+        except OSError:
+            pass
+        finally:
+            self._pipe.close()
+
+    def text(self) -> str:
+        """Decode the kept tail; only these bytes are ever decoded."""
+        tail = bytes(self._tail)
+        if len(tail) == OUTPUT_TAIL_BYTES:
+            # The cut may land inside a UTF-8 sequence: skip its continuation bytes
+            start = 0
+            while start < 3 and 0x80 <= tail[start] <= 0xBF:
+                start += 1
+            tail = tail[start:]
+        return tail.decode("utf-8", "replace")
+
+
+@dataclass(slots=True, frozen=True)
 class RunResult:
-    cmd: List[str]
+    cmd: Tuple[str, ...]
     cwd: Optional[str]
     code: int
     stdout: str
@@ -79,8 +188,32 @@ class Runner:
     """
     Short-lived command runner. Use Supervisor for long-lived services.
     """
-    def __init__(self):
-        pass
+    def __init__(self, kill_grace_s: float = KILL_GRACE_S):
+        self.kill_grace_s = kill_grace_s
+
+    def _terminate(self, proc: subprocess.Popen) -> None:
+        """Stop a timed-out command and everything it spawned.
+
+        POSIX commands run in their own session, so the whole process group
+        gets SIGTERM first and SIGKILL only if it outlives the grace period.
+        """
+        if not IS_POSIX:
+            proc.kill()
+            proc.wait()
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        try:
+            proc.wait(timeout=self.kill_grace_s)
+        except subprocess.TimeoutExpired:
+            pass
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
 
     def run(self, cmd: List[str], cwd: Optional[str] = None, timeout_s: int = 60, env: Optional[Dict[str, str]] = None, demote: bool = True) -> RunResult:
         """
@@ -99,35 +232,76 @@ class Runner:
         extra_kwargs: Dict[str, Any] = {}
 
         if IS_POSIX:
-            def preexec():
-                try:
-                    _setup_process_limits(demote=demote)
-                except Exception:
-                    pass  # Best effort - don't block command execution on native/dev
+            # uid/gid switch is done by subprocess itself; only the rlimits and CPU
+            # affinity of demoted commands still need a Python callback in the child.
+            # Skills (demote=False) skip preexec_fn and take the fast spawn path;
+            # their file-size limit is applied after spawn (see below).
+            if demote and CAN_DEMOTE:
+                extra_kwargs["user"] = SANDBOX_UID
+                extra_kwargs["group"] = SANDBOX_GID
+                extra_kwargs["extra_groups"] = []
+            if demote and (HAS_RESOURCE_LIMITS or RUNNER_CPUS):
+                def preexec():
+                    try:
+                        _apply_rlimits(demote=True)
+                        if RUNNER_CPUS:
+                            # Before exec, so every process of the command inherits it
+                            os.sched_setaffinity(0, RUNNER_CPUS)
+                    except Exception:
+                        pass  # Best effort - don't block command execution on native/dev
 
-            extra_kwargs["preexec_fn"] = preexec
+                extra_kwargs["preexec_fn"] = preexec
+            # Own process group, so a timeout can reach grandchildren too
+            extra_kwargs["start_new_session"] = True
         elif IS_WINDOWS:
             # CREATE_NEW_PROCESS_GROUP allows clean termination on Windows
             CREATE_NEW_PROCESS_GROUP = 0x00000200
             extra_kwargs["creationflags"] = CREATE_NEW_PROCESS_GROUP
 
-        started = datetime.utcnow().isoformat() + "Z"
-        proc = subprocess.run(
+        started = _iso_now()
+        # Pipes are drained continuously by reader threads that keep only the
+        # tail: memory stays bounded and the child never stalls on a full pipe.
+        proc = subprocess.Popen(
             cmd,
             cwd=cwd,
             env=env,
-            capture_output=True,
-            text=True,
-            timeout=timeout_s,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=-1,
             **extra_kwargs,
         )
-        finished = datetime.utcnow().isoformat() + "Z"
+        if IS_POSIX and "preexec_fn" not in extra_kwargs:
+            # Skills keep the fast spawn path, so their limits and affinity are
+            # set from the parent after the child has started: the command may
+            # already be running, and processes it forked before this call
+            # keep the unrestricted settings
+            _apply_rlimits_to(proc.pid, demote)
+            if RUNNER_CPUS:
+                try:
+                    os.sched_setaffinity(proc.pid, RUNNER_CPUS)
+                except OSError:
+                    pass
+        readers = (_TailReader(proc.stdout), _TailReader(proc.stderr))
+        for reader in readers:
+            reader.start()
+        try:
+            code = proc.wait(timeout=timeout_s)
+        except subprocess.TimeoutExpired:
+            self._terminate(proc)
+            raise
+        finally:
+            # A background process may still hold the pipe open; don't wait on it
+            deadline = time.monotonic() + self.kill_grace_s
+            for reader in readers:
+                reader.join(timeout=max(0.0, deadline - time.monotonic()))
+        finished = _iso_now()
+        stdout, stderr = (reader.text() for reader in readers)
         return RunResult(
-            cmd=cmd,
+            cmd=tuple(cmd),
             cwd=cwd,
-            code=proc.returncode,
-            stdout=proc.stdout[-20000:],  # cap
-            stderr=proc.stderr[-20000:],
+            code=code,
+            stdout=stdout,
+            stderr=stderr,
             started_at=started,
             finished_at=finished,
         )
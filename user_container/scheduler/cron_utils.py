@@ -8,6 +8,7 @@ Provides:
 """
 
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 from croniter import croniter
@@ -16,7 +17,20 @@ from croniter import croniter
 # Hardcoded timezone for MVP (see TODO.md)
 DEFAULT_TIMEZONE = "Europe/Warsaw"
 
+WEEKDAY_NAMES = {
+    "0": "Sunday", "7": "Sunday",
+    "1": "Monday", "2": "Tuesday", "3": "Wednesday",
+    "4": "Thursday", "5": "Friday", "6": "Saturday"
+}
 
+MONTH_NAMES = {
+    "1": "January", "2": "February", "3": "March", "4": "April",
+    "5": "May", "6": "June", "7": "July", "8": "August",
+    "9": "September", "10": "October", "11": "November", "12": "December"
+}
+
+
+@lru_cache(maxsize=1024)
 def parse_cron(expression: str) -> bool:
     """
     Validate a CRON expression.
@@ -54,6 +68,9 @@ def get_next_run(expression: str, after: Optional[datetime] = None) -> Optional[
     Examples:
         >>> get_next_run("0 9 * * *")  # Returns next 9:00 AM
     """
+    # Validity is cached, so known-bad expressions never reach croniter again
+    if not parse_cron(expression):
+        return None
     try:
         base = after or datetime.now()
         cron = croniter(expression, base)
@@ -62,6 +79,7 @@ def get_next_run(expression: str, after: Optional[datetime] = None) -> Optional[
         return None
 
 
+@lru_cache(maxsize=256)
 def humanize_cron(expression: str) -> str:
     """
     Convert a CRON expression to human-readable description.
@@ -87,6 +105,9 @@ def humanize_cron(expression: str) -> str:
 
         minute, hour, day, month, weekday = parts
 
+        # Repeating within the day ("*/5 * * * *"), or at set times
+        interval = _describe_interval(minute, hour)
+
         # Build time string
         time_str = ""
         if minute != "*" and hour != "*":
@@ -96,53 +117,39 @@ def humanize_cron(expression: str) -> str:
         elif minute != "*":
             time_str = f"at minute {minute}"
 
-        # Weekday names
-        weekday_names = {
-            "0": "Sunday", "7": "Sunday",
-            "1": "Monday", "2": "Tuesday", "3": "Wednesday",
-            "4": "Thursday", "5": "Friday", "6": "Saturday"
-        }
-
-        # Month names
-        month_names = {
-            "1": "January", "2": "February", "3": "March", "4": "April",
-            "5": "May", "6": "June", "7": "July", "8": "August",
-            "9": "September", "10": "October", "11": "November", "12": "December"
-        }
-
         # Determine schedule type
         if day == "*" and month == "*" and weekday == "*":
             # Daily
-            return f"Daily {time_str}".strip()
+            return interval or f"Daily {time_str}".strip()
 
         elif day == "*" and month == "*" and weekday != "*":
             # Weekly on specific day(s)
             if "-" in weekday:
                 # Range like 1-5
                 start, end = weekday.split("-")
-                return f"Every {weekday_names.get(start, start)} to {weekday_names.get(end, end)} {time_str}".strip()
+                days = f"{WEEKDAY_NAMES.get(start, start)} to {WEEKDAY_NAMES.get(end, end)}"
             elif "," in weekday:
                 # Multiple days
-                days = [weekday_names.get(d.strip(), d) for d in weekday.split(",")]
-                return f"Every {', '.join(days)} {time_str}".strip()
+                days = ", ".join(WEEKDAY_NAMES.get(d.strip(), d) for d in weekday.split(","))
             else:
-                day_name = weekday_names.get(weekday, f"day {weekday}")
-                return f"Every {day_name} {time_str}".strip()
+                days = WEEKDAY_NAMES.get(weekday, f"day {weekday}")
+            if interval:
+                return f"{interval} on {days}"
+            return f"Every {days} {time_str}".strip()
 
         elif day != "*" and month == "*" and weekday == "*":
             # Monthly on specific day
+            if interval:
+                return f"{interval} on day {day} of the month"
             return f"Monthly on day {day} {time_str}".strip()
 
         elif day != "*" and month != "*":
             # Yearly on specific date
-            month_name = month_names.get(month, f"month {month}")
+            month_name = MONTH_NAMES.get(month, f"month {month}")
+            if interval:
+                return f"{interval} on {month_name} {day}"
             return f"Yearly on {month_name} {day} {time_str}".strip()
 
-        elif minute == "*" and hour == "*":
-            # Every minute/hour
-            if day == "*" and month == "*" and weekday == "*":
-                return "Every minute"
-
         # Fallback: return expression with prefix
         return f"Cron: {expression}"
 
@@ -150,6 +157,42 @@ def humanize_cron(expression: str) -> str:
         return expression
 
 
+def _step(field: str) -> Optional[int]:
+    """N for a "*/N" field, else None."""
+    if field.startswith("*/") and field[2:].isdigit() and int(field[2:]) > 0:
+        return int(field[2:])
+    return None
+
+
+def _every(step: int, unit: str, period: int, parent: str, at: str = "") -> str:
+    """Describe a "*/step" field; a step that doesn't divide the period restarts with each parent unit."""
+    description = f"Every {unit}" if step == 1 else f"Every {step} {unit}s"
+    if at:
+        description += f" {at}"
+    if period % step:
+        description += f", restarting each {parent}"
+    return description
+
+
+def _describe_interval(minute: str, hour: str) -> Optional[str]:
+    """Describe minute/hour fields that repeat within a day; None for set times."""
+    if hour == "*":
+        if minute == "*":
+            return "Every minute"
+        step = _step(minute)
+        if step:
+            return _every(step, "minute", 60, "hour")
+        if minute.isdigit():
+            return "Every hour" if int(minute) == 0 else f"Every hour at minute {minute}"
+        return None
+    step = _step(hour)
+    if step and minute.isdigit():
+        return _every(step, "hour", 24, "day", "" if int(minute) == 0 else f"at minute {minute}")
+    if hour.isdigit() and minute == "*":
+        return f"Every minute from {hour.zfill(2)}:00 to {hour.zfill(2)}:59"
+    return None
+
+
 def get_schedule_description(expression: str) -> str:
     """
     Alias for humanize_cron for consistency with tool schema.
@@ -0,0 +1,128 @@
+"""
+LightScheduler - minimal heap-based CRON scheduler.
+
+Alternative to APScheduler's BackgroundScheduler for the handful of jobs
+a container holds: one daemon thread sleeps until the earliest fire time,
+hands the callback to a small thread pool and re-arms the job from its
+CRON expression. Enabled with SCHEDULER_BACKEND=light.
+
+Implements the subset of the BackgroundScheduler API JobScheduler uses:
+start(), shutdown(), add_job(), remove_job().
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from croniter import croniter
+
+from user_container.logger import log
+
+
+class _CronJob:
+    __slots__ = ("id", "name", "expression", "func", "args")
+
+    def __init__(self, job_id: str, name: str, expression: str, func: Callable, args: Sequence[Any]):
+        self.id = job_id
+        self.name = name
+        self.expression = expression
+        self.func = func
+        self.args = tuple(args)
+
+
+class LightScheduler:
+    """Single-thread CRON scheduler backed by a heap of (fire_time, seq, job)."""
+
+    def __init__(self, timezone: str, max_workers: int = 4):
+        self.timezone = ZoneInfo(timezone)
+        self._heap: List[Tuple[float, int, _CronJob]] = []
+        self._jobs: Dict[str, _CronJob] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._max_workers = max_workers
+
+    def _next_fire(self, expression: str) -> float:
+        return croniter(expression, datetime.now(self.timezone)).get_next(float)
+
+    def _push(self, job: _CronJob) -> None:
+        heapq.heappush(self._heap, (self._next_fire(job.expression), next(self._seq), job))
+
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="light-scheduler")
+            self._thread = threading.Thread(target=self._loop, name="light-scheduler", daemon=True)
+            self._thread.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify_all()
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def add_job(
+        self,
+        func: Callable,
+        trigger: str,
+        args: Sequence[Any] = (),
+        id: str = None,
+        name: str = None,
+        replace_existing: bool = False,
+    ) -> None:
+        """Schedule func(*args) on a CRON expression (trigger); raises ValueError if invalid."""
+        job_id = id or str(next(self._seq))
+        job = _CronJob(job_id, name or job_id, trigger, func, args)
+        with self._cond:
+            if job_id in self._jobs and not replace_existing:
+                raise ValueError(f"Job {job_id} already exists")
+            self._jobs[job_id] = job
+            self._push(job)
+            self._cond.notify()
+
+    def remove_job(self, job_id: str) -> None:
+        """Unschedule a job; its heap entry is dropped lazily when it comes up."""
+        with self._cond:
+            if self._jobs.pop(job_id, None) is None:
+                raise KeyError(job_id)
+
+    def _loop(self) -> None:
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                fire_at, _, job = self._heap[0]
+                delay = fire_at - time.time()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                # Skip entries of removed or replaced jobs
+                if self._jobs.get(job.id) is not job:
+                    continue
+                self._push(job)
+                try:
+                    self._executor.submit(self._run, job)
+                except RuntimeError:
+                    break  # executor shut down
+
+    @staticmethod
+    def _run(job: _CronJob) -> None:
+        try:
+            job.func(*job.args)
+        except Exception as e:
+            log(f"[Scheduler] Job {job.id} ({job.name}) raised: {e}")
@@ -5,12 +5,14 @@ Pydantic models for Job Scheduler.
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict
 
 
 class ScheduledJob(BaseModel):
     """A scheduled/recurring job definition."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     conversation_id: str
     name: str
@@ -25,13 +27,12 @@ class ScheduledJob(BaseModel):
     next_run_at: Optional[datetime] = None
     run_count: int = 0
 
-    class Config:
-        from_attributes = True
-
 
 class ScheduledJobRun(BaseModel):
     """A single execution of a scheduled job."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     scheduled_job_id: str
     job_id: str
@@ -40,9 +41,6 @@ class ScheduledJobRun(BaseModel):
     status: str  # "running", "completed", "failed"
     result_preview: Optional[str] = None
 
-    class Config:
-        from_attributes = True
-
 
 class CreateScheduledJobRequest(BaseModel):
     """Request to create a scheduled job (from agent tool)."""
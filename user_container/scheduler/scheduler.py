@@ -7,22 +7,106 @@ Manages scheduled jobs:
 - Triggers jobs by creating jobs and enqueuing to in-process queue
 """
 
+import json
+import os
+import shutil
+import stat
 import uuid
-from datetime import datetime
+from functools import lru_cache
 from typing import TYPE_CHECKING, Optional
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from user_container.config import settings
 from user_container.logger import log
-from user_container.scheduler.cron_utils import get_next_run, DEFAULT_TIMEZONE
-from user_container.usage import UsageTracker
+from user_container.scheduler.cron_utils import get_next_run, parse_cron, DEFAULT_TIMEZONE
+from user_container.scheduler.light_scheduler import LightScheduler
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_context(context: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(context, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(context)
+
+
+_loads_context = orjson.loads if orjson is not None else json.loads
 
 if TYPE_CHECKING:
     from user_container.db.db import DB
     from user_container.jobs.queue import JobQueue
 
 
+# ioctl(FICLONE) from linux/fs.h: share the source's extents (reflink, CoW)
+_FICLONE = 0x40049409
+
+
+def _fast_copy(src: str, dst: str) -> str:
+    """
+    copy2 replacement that avoids moving bytes through userspace.
+
+    Tries a reflink (FICLONE: Btrfs, XFS, bcachefs), then an in-kernel
+    os.copy_file_range, then plain shutil.copy2. On filesystems without
+    reflink support the result is the same as copy2.
+    """
+    if fcntl is None or not hasattr(os, "copy_file_range"):
+        return shutil.copy2(src, dst)
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            except OSError:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+        shutil.copystat(src, dst)
+        return dst
+    except OSError:
+        return shutil.copy2(src, dst)
+
+
+def render_prompt(job_id: str, prompt: str, context_json: Optional[str], files_dir: Optional[str]) -> str:
+    """Build the prompt a scheduled run receives: the task plus its context block."""
+    if not context_json:
+        return prompt
+    try:
+        context = _loads_context(context_json)
+    except json.JSONDecodeError:  # orjson's error subclasses it
+        log(f"[Scheduler] Failed to parse context_json for job {job_id}")
+        return prompt
+    context_parts = []
+    if context.get("steps"):
+        steps_str = "\n".join(f"- {s}" for s in context["steps"])
+        context_parts.append(f"Steps to follow:\n{steps_str}")
+    if context.get("variables"):
+        vars_str = "\n".join(f"- {k}: {v}" for k, v in context["variables"].items())
+        context_parts.append(f"Variables:\n{vars_str}")
+    if files_dir:
+        context_parts.append(f"Working directory for this scheduler: {files_dir}")
+    if context_parts:
+        return f"{prompt}\n\n--- Context ---\n" + "\n\n".join(context_parts)
+    return prompt
+
+
+@lru_cache(maxsize=256)
+def _trigger_for(expression: str, timezone: str) -> CronTrigger:
+    """Shared CronTrigger per (expression, timezone) - triggers hold no per-job state."""
+    return CronTrigger.from_crontab(expression, timezone=timezone)
+
+
 class JobScheduler:
     """
     Background job scheduler using APScheduler.
@@ -43,7 +127,11 @@ class JobScheduler:
         """
         self.db = db
         self.job_queue = job_queue
-        self.scheduler = BackgroundScheduler(timezone=DEFAULT_TIMEZONE)
+        self._light = settings.scheduler_backend == "light"
+        if self._light:
+            self.scheduler = LightScheduler(timezone=DEFAULT_TIMEZONE)
+        else:
+            self.scheduler = BackgroundScheduler(timezone=DEFAULT_TIMEZONE)
         self._started = False
 
     def start(self) -> None:
@@ -104,10 +192,6 @@ class JobScheduler:
         Returns:
             Job ID
         """
-        import json
-        import os
-        import shutil
-
         job_id = str(uuid.uuid4())
         now = self.db.now()
 
@@ -121,21 +205,24 @@ class JobScheduler:
             files_dir = f"/workspace/scheduler/{job_id}"
             os.makedirs(files_dir, exist_ok=True)
             for src_path in files_to_copy:
-                if os.path.exists(src_path):
-                    try:
-                        dst_path = os.path.join(files_dir, os.path.basename(src_path))
-                        if os.path.isdir(src_path):
-                            shutil.copytree(src_path, dst_path)
-                        else:
-                            shutil.copy2(src_path, dst_path)
-                        log(f"[Scheduler] Copied {src_path} -> {dst_path}")
-                    except Exception as e:
-                        log(f"[Scheduler] Failed to copy {src_path}: {e}")
-                else:
+                # One stat per source answers both "exists?" and "directory?"
+                try:
+                    st = os.stat(src_path)
+                except OSError:
                     log(f"[Scheduler] Source file not found: {src_path}")
+                    continue
+                try:
+                    dst_path = os.path.join(files_dir, os.path.basename(src_path))
+                    if stat.S_ISDIR(st.st_mode):
+                        shutil.copytree(src_path, dst_path, copy_function=_fast_copy)
+                    else:
+                        _fast_copy(src_path, dst_path)
+                    log(f"[Scheduler] Copied {src_path} -> {dst_path}")
+                except Exception as e:
+                    log(f"[Scheduler] Failed to copy {src_path}: {e}")
 
         # Serialize context
-        context_json = json.dumps(context) if context else None
+        context_json = _dumps_context(context) if context else None
 
         job_data = {
             "id": job_id,
@@ -153,7 +240,8 @@ class JobScheduler:
             "next_run_at": next_run_str,
             "run_count": 0,
             "context_json": context_json,
-            "files_dir": files_dir
+            "files_dir": files_dir,
+            "rendered_prompt": render_prompt(job_id, prompt, context_json, files_dir)
         }
 
         # Save to database
@@ -173,9 +261,6 @@ class JobScheduler:
         Args:
             job_id: Job ID to remove
         """
-        import os
-        import shutil
-
         # Get job data to find files_dir
         job_data = self.db.get_scheduled_job(job_id)
 
@@ -259,11 +344,18 @@ class JobScheduler:
         except Exception:
             pass
 
-        try:
-            trigger = CronTrigger.from_crontab(cron_expression, timezone=DEFAULT_TIMEZONE)
-        except ValueError as e:
-            log(f"[Scheduler] Invalid CRON expression for job {job_id}: {e}")
-            return
+        if self._light:
+            # LightScheduler takes the expression itself as its trigger
+            if not parse_cron(cron_expression):
+                log(f"[Scheduler] Invalid CRON expression for job {job_id}: {cron_expression}")
+                return
+            trigger = cron_expression
+        else:
+            try:
+                trigger = _trigger_for(cron_expression, DEFAULT_TIMEZONE)
+            except ValueError as e:
+                log(f"[Scheduler] Invalid CRON expression for job {job_id}: {e}")
+                return
 
         self.scheduler.add_job(
             func=self._trigger_job,
@@ -279,8 +371,6 @@ class JobScheduler:
         Called when a scheduled job fires.
         Creates a NEW conversation and job, enqueues to in-process queue.
         """
-        import json
-
         sj = self.db.get_scheduled_job(scheduled_job_id)
         if not sj:
             log(f"[Scheduler] Scheduled job {scheduled_job_id} not found")
@@ -290,58 +380,26 @@ class JobScheduler:
             log(f"[Scheduler] Scheduled job {scheduled_job_id} is disabled, skipping")
             return None
 
-        # Create NEW conversation for this run
+        # Prompt with context is rendered when the job is saved; rows created
+        # before that, or edited since, are rendered now and stored below
+        prompt = sj.get("rendered_prompt")
+        rendered_now = None
+        if prompt is None:
+            prompt = rendered_now = render_prompt(
+                scheduled_job_id, sj["prompt"], sj.get("context_json"), sj.get("files_dir")
+            )
+
+        # Create NEW conversation for this run, update stats and log the run
+        # in one transaction, before the job can be picked up by a worker
         new_conv_id = str(uuid.uuid4())
-        self.db.execute("""
-            INSERT INTO conversations(id, created_at, scheduler_id, is_scheduler_run)
-            VALUES (?, ?, ?, 1)
-        """, (new_conv_id, self.db.now(), scheduled_job_id))
-
-        # Build prompt with context if available
-        prompt = sj["prompt"]
-        context_json = sj.get("context_json")
-        files_dir = sj.get("files_dir")
-
-        if context_json:
-            try:
-                context = json.loads(context_json)
-                context_parts = []
-                if context.get("steps"):
-                    steps_str = "\n".join(f"- {s}" for s in context["steps"])
-                    context_parts.append(f"Steps to follow:\n{steps_str}")
-                if context.get("variables"):
-                    vars_str = "\n".join(f"- {k}: {v}" for k, v in context["variables"].items())
-                    context_parts.append(f"Variables:\n{vars_str}")
-                if files_dir:
-                    context_parts.append(f"Working directory for this scheduler: {files_dir}")
-                if context_parts:
-                    prompt = f"{prompt}\n\n--- Context ---\n" + "\n\n".join(context_parts)
-            except json.JSONDecodeError:
-                log(f"[Scheduler] Failed to parse context_json for job {scheduled_job_id}")
-
-        # Create job via in-process queue
         job_id = str(uuid.uuid4())
-        self.db.save_message_from_dict(new_conv_id, {"role": "user", "content": prompt})
-        self.job_queue.create_job(job_id, new_conv_id, prompt, skip_history=True)
-        self.job_queue.enqueue(job_id)
-
-        # Update scheduled job stats
-        now = self.db.now()
         next_run = get_next_run(sj["cron_expression"])
         next_run_str = next_run.isoformat() if next_run else None
+        self.db.trigger_job_txn(scheduled_job_id, new_conv_id, job_id, prompt, next_run_str, rendered_now, sj)
 
-        self.db.update_scheduled_job(scheduled_job_id, {
-            "last_run_at": now,
-            "next_run_at": next_run_str,
-            "run_count": sj.get("run_count", 0) + 1
-        })
-
-        # Log the run
-        self.db.add_scheduled_job_run(
-            scheduled_job_id=scheduled_job_id,
-            job_id=job_id,
-            status="pending"
-        )
+        # Create job via in-process queue
+        self.job_queue.create_job(job_id, new_conv_id, prompt, skip_history=True)
+        self.job_queue.enqueue(job_id)
 
         log(f"[Scheduler] Triggered job {scheduled_job_id} -> created conversation {new_conv_id}, job {job_id}")
         return (job_id, new_conv_id)
@@ -2,11 +2,18 @@
 
 import json
 import os
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Any, Dict, Optional, Set
 
 from user_container.platform import HAS_SANDBOX_USER
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # SINGLE SOURCE OF TRUTH: Safe env vars that user processes can have
 # Everything NOT in this list is considered sensitive and goes to secrets.json
@@ -25,10 +32,59 @@ SAFE_ENV_WHITELIST: Set[str] = {
 SECRETS_FILE = Path.home() / ".zeno" / "secrets.json"
 
 
+def _read_secrets_file() -> Dict[str, str]:
+    if orjson is not None:
+        return orjson.loads(SECRETS_FILE.read_bytes())
+    with open(SECRETS_FILE) as f:
+        return json.load(f)
+
+
+def _write_secrets_file(secrets: Dict[str, str]) -> None:
+    if orjson is not None:
+        SECRETS_FILE.write_bytes(orjson.dumps(secrets, option=orjson.OPT_INDENT_2))
+    else:
+        with open(SECRETS_FILE, "w") as f:
+            json.dump(secrets, f, indent=2)
+
+
+# Parsed secrets.json, reloaded only when the file's mtime changes
+_secrets_cache: Dict[str, Any] = {"mtime": None, "secrets": {}}
+_secrets_lock = threading.Lock()
+
+
+def _load_secrets() -> Optional[Dict[str, str]]:
+    """Return the parsed secrets file (None if missing or unreadable)."""
+    try:
+        mtime = SECRETS_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+    with _secrets_lock:
+        if mtime != _secrets_cache["mtime"]:
+            try:
+                secrets = _read_secrets_file()
+            except Exception:
+                return None
+            _secrets_cache.update(mtime=mtime, secrets=secrets)
+        return _secrets_cache["secrets"]
+
+
+@lru_cache(maxsize=1)
+def _build_safe_env() -> Dict[str, str]:
+    # Intersect with the ~20 whitelisted names instead of scanning all of os.environ
+    env = {k: os.environ[k] for k in SAFE_ENV_WHITELIST & os.environ.keys()}
+    if HAS_SANDBOX_USER:
+        # Override HOME for sandbox user - they can't write to /root
+        env['HOME'] = '/home/sandbox'
+    # Otherwise keep HOME from os.environ (already in SAFE_ENV_WHITELIST)
+    return env
+
+
 def get_safe_env() -> Dict[str, str]:
     """
     Get a filtered environment dict safe for user code.
     Uses whitelist approach - only explicitly allowed variables.
+    Built once per process (the environment doesn't change after startup);
+    each caller gets its own copy to modify.
 
     Note: HOME is overridden to /home/sandbox in Docker because:
     - Main process runs as root with HOME=/root
@@ -36,12 +92,7 @@ def get_safe_env() -> Dict[str, str]:
     - Tools like uv need writable HOME for cache (~/.cache/uv)
     On native (macOS/Windows), HOME is preserved from the environment.
     """
-    env = {k: v for k, v in os.environ.items() if k in SAFE_ENV_WHITELIST}
-    if HAS_SANDBOX_USER:
-        # Override HOME for sandbox user - they can't write to /root
-        env['HOME'] = '/home/sandbox'
-    # Otherwise keep HOME from os.environ (already in SAFE_ENV_WHITELIST)
-    return env
+    return dict(_build_safe_env())
 
 
 def get_secret(key: str) -> Optional[str]:
@@ -57,15 +108,10 @@ def get_secret(key: str) -> Optional[str]:
     """
     key_lower = key.lower()
 
-    # Try secrets file first
-    if SECRETS_FILE.exists():
-        try:
-            with open(SECRETS_FILE) as f:
-                secrets = json.load(f)
-            if key_lower in secrets:
-                return secrets[key_lower]
-        except Exception:
-            pass
+    # Try secrets file first (parsed once, cached until it changes)
+    secrets = _load_secrets()
+    if secrets and key_lower in secrets:
+        return secrets[key_lower]
 
     # Fallback to environment variable (for development)
     return os.getenv(key.upper())
@@ -88,8 +134,7 @@ def init_secrets_file() -> None:
 
     # Write secrets file
     try:
-        with open(SECRETS_FILE, "w") as f:
-            json.dump(secrets, f, indent=2)
+        _write_secrets_file(secrets)
         # Make readable only by owner (600 permissions)
         os.chmod(SECRETS_FILE, 0o600)
     except Exception as e:
@@ -0,0 +1,22 @@
+"""Shared HTTP client for app-deploy scripts that call the local API."""
+
+import httpx
+
+API_BASE = "http://localhost:18000"
+
+_client = None
+
+
+def get_client() -> httpx.Client:
+    """Return the process-wide client (created on first use, then reused)."""
+    global _client
+    if _client is None:
+        _client = httpx.Client(
+            base_url=API_BASE,
+            timeout=30,
+            # Plain HTTP to localhost: no CA bundle to load, no proxy env lookup
+            verify=False,
+            trust_env=False,
+            transport=httpx.HTTPTransport(retries=0),
+        )
+    return _client
@@ -0,0 +1,25 @@
+"""runtime.db access shared by app-deploy scripts."""
+
+import sqlite3
+import time
+
+
+def open_db(path: str) -> sqlite3.Connection:
+    """Open runtime.db like the main app's connections do.
+
+    Same mmap_size/busy_timeout, and the same rollback journal (no WAL: the
+    app avoids the .shm mmap under fork). Everything else stays at SQLite's
+    defaults, as in the app.
+    """
+    conn = sqlite3.connect(path, timeout=5.0)
+    conn.executescript("PRAGMA mmap_size=0; PRAGMA busy_timeout=5000;")
+    return conn
+
+
+def iso_now() -> str:
+    """Current UTC time as ISO-8601 with a trailing Z, formatted from time_ns().
+
+    Same format as the runner's timestamps in the main app.
+    """
+    secs, ns = divmod(time.time_ns(), 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs)) + f".{ns // 1000:06d}Z"
@@ -0,0 +1,28 @@
+"""App URL helper shared by app-deploy scripts."""
+
+import os
+from urllib.parse import urlparse
+
+# BASE_URL is fixed for the life of the process: parse it once
+_BASE_URL = os.getenv("BASE_URL", "http://localhost:18000")
+_PARSED = urlparse(_BASE_URL)
+_SCHEME = _PARSED.scheme  # http or https
+_HOST = _PARSED.hostname  # e.g., "localhost" or "user-001.zeno.blue"
+_PORT = _PARSED.port      # e.g., 18000 or None
+
+
+def get_app_url(app_id: str) -> str:
+    """
+    Generate app URL based on BASE_URL environment variable.
+
+    Local (localhost/has port): http://{app_id}.lvh.me:{port}/
+    Production ({user_id}.{domain}): {scheme}://{app_id}.{user_id}.{domain}/
+    """
+    # Local mode: localhost or has explicit port
+    if _HOST in ("localhost", "127.0.0.1") or _PORT:
+        port_suffix = f":{_PORT}" if _PORT else ":18000"
+        return f"http://{app_id}.lvh.me{port_suffix}/"
+
+    # Production mode: {app_id}.{base_host} (subdomain of subdomain)
+    # e.g., user-001.zeno.blue → my-app.user-001.zeno.blue
+    return f"{_SCHEME}://{app_id}.{_HOST}/"
@@ -8,18 +8,40 @@ import sys
 import argparse
 import json
 import os
+from collections import deque
 
 LOGS_DIR = "/workspace/logs"
+TAIL_BLOCK_SIZE = 64 * 1024
 
 
 def tail_file(file_path: str, max_lines: int) -> str:
-    """Read last N lines from a file."""
-    if not os.path.exists(file_path):
+    """Read last N lines from a file, reading backwards from the end in blocks."""
+    if not os.path.exists(file_path) or max_lines <= 0:
         return ""
-    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-        lines = f.readlines()
-        tail_lines = lines[-max_lines:] if len(lines) > max_lines else lines
-        return "".join(tail_lines)
+    chunks = deque()
+    newlines = 0
+    with open(file_path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        # One newline more than max_lines marks where the first wanted line starts
+        while pos > 0 and newlines <= max_lines:
+            size = min(TAIL_BLOCK_SIZE, pos)
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size)
+            chunks.appendleft(chunk)
+            newlines += chunk.count(b"\n")
+    tail_lines = b"".join(chunks).splitlines(keepends=True)[-max_lines:]
+    text = b"".join(tail_lines).decode("utf-8", errors="replace")
+    # Same newline translation as reading in text mode
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def write_json(data: dict) -> None:
+    """Write data as indented JSON straight to stdout as UTF-8 bytes."""
+    # No \uXXXX escaping of non-ASCII log text
+    out = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    sys.stdout.buffer.write(out + b"\n")
+    sys.stdout.flush()
 
 
 def main():
@@ -41,12 +63,12 @@ def main():
     logs = tail_file(log_path, args.lines)
     line_count = len(logs.splitlines()) if logs else 0
 
-    print(json.dumps({
+    write_json({
         "app_id": app_id,
         "logs": logs,
         "line_count": line_count,
         "log_path": log_path
-    }, indent=2))
+    })
 
 
 if __name__ == "__main__":
@@ -9,7 +9,7 @@ import argparse
 import json
 import httpx
 
-API_BASE = "http://localhost:18000"
+from _client import get_client
 
 
 def main():
@@ -20,7 +20,7 @@ def main():
     app_id = args.app_id
 
     try:
-        response = httpx.delete(f"{API_BASE}/apps/{app_id}", timeout=30)
+        response = get_client().delete(f"/apps/{app_id}")
 
         if response.status_code == 404:
             print(json.dumps({
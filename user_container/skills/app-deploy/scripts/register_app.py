@@ -5,68 +5,61 @@
 import sys
 import argparse
 import json
-import sqlite3
 import os
+import re
 import uuid
-import secrets
 import socket
 import time
-from datetime import datetime
-from urllib.parse import urlparse
-
-DB_PATH = "/data/runtime.db"
 
+from _db import iso_now, open_db
+from _url_utils import get_app_url
 
-def get_app_url(app_id: str) -> str:
-    """
-    Generate app URL based on BASE_URL environment variable.
-
-    Local (localhost/has port): http://{app_id}.lvh.me:{port}/
-    Production ({user_id}.{domain}): {scheme}://{app_id}.{user_id}.{domain}/
-    """
-    base_url = os.getenv("BASE_URL", "http://localhost:18000")
-    parsed = urlparse(base_url)
-    scheme = parsed.scheme  # http or https
-    host = parsed.hostname  # e.g., "localhost" or "user-001.zeno.blue"
-    port = parsed.port      # e.g., 18000 or None
+DB_PATH = "/data/runtime.db"
 
-    # Local mode: localhost or has explicit port
-    if host in ("localhost", "127.0.0.1") or port:
-        port_suffix = f":{port}" if port else ":18000"
-        return f"http://{app_id}.lvh.me{port_suffix}/"
+# Runs of anything that isn't valid in a DNS label collapse to one dash
+_SAFE_NAME_RE = re.compile(r"[^a-z0-9]+")
 
-    # Production mode: {app_id}.{base_host} (subdomain of subdomain)
-    # e.g., user-001.zeno.blue → my-app.user-001.zeno.blue
-    return f"{scheme}://{app_id}.{host}/"
 
 def find_free_port(db_cursor, start_port=3000, end_port=4000):
     """Find a port that is not in DB and actually free on host."""
 
     # 1. Get ports used in DB
     db_cursor.execute("SELECT port FROM apps WHERE status='running'")
-    used_ports_db = set(row[0] for row in db_cursor.fetchall())
-
-    for port in range(start_port, end_port):
-        if port in used_ports_db:
-            continue
+    used_ports_db = {row[0] for row in db_cursor}
 
-        # 2. Check if actually free on OS
+    # Set difference drops DB-taken ports in C; sorted keeps lowest-first order
+    for port in sorted(set(range(start_port, end_port)) - used_ports_db):
+        # 2. Check if actually free on OS: a local bind is one syscall and sends
+        # nothing. Wildcard address so a listener on any interface counts as taken;
+        # SO_REUSEADDR so ports only lingering in TIME_WAIT count as free.
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            if s.connect_ex(('localhost', port)) != 0:
-                return port
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                s.bind(('0.0.0.0', port))
+            except OSError:
+                continue
+            return port
 
     raise RuntimeError("No free ports available in range")
 
 
 def wait_for_port(port: int, timeout: float = 10.0, interval: float = 0.5) -> bool:
-    """Wait for a port to become available (app listening). Returns True if port opens."""
-    start = time.time()
-    while time.time() - start < timeout:
+    """Wait for a port to become available (app listening). Returns True if port opens.
+
+    Polls with exponential backoff from 10ms up to `interval`, so fast-starting
+    apps are detected almost immediately.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while True:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             if s.connect_ex(('127.0.0.1', port)) == 0:
                 return True
-        time.sleep(interval)
-    return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, interval)
 
 def main():
     parser = argparse.ArgumentParser(description="Register and deploy a web application.")
@@ -82,44 +75,37 @@ def main():
         sys.exit(1)
 
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = open_db(DB_PATH)
+        # Autocommit mode with one explicit write transaction: the port pick and
+        # the INSERT take the write lock once and cost a single commit. The apps
+        # table itself is created by the app at startup (see db/db.py).
+        conn.isolation_level = None
         cur = conn.cursor()
-        
-        # Ensure table exists (just in case, though app.py does it)
-        cur.execute("""
-          CREATE TABLE IF NOT EXISTS apps (
-            app_id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            port INTEGER NOT NULL,
-            cwd TEXT NOT NULL,
-            cmd TEXT NOT NULL,
-            status TEXT NOT NULL,
-            api_token TEXT UNIQUE,
-            created_at TEXT NOT NULL
-          )
-        """)
-
-        # Find port
-        port = find_free_port(cur)
-        
-        # Generate ID
-        # Simple ID from name + short hash to be subdomain-friendly
-        # e.g. "my-app" -> "my-app-a1b2"
-        safe_name = "".join(c if c.isalnum() else "-" for c in args.name.lower())
-        uid = str(uuid.uuid4())[:4]
-        app_id = f"{safe_name}-{uid}"
-        
-        # Insert
-        now = datetime.utcnow().isoformat() + "Z"
-        cmd_json = json.dumps(args.cmd.split()) # Supervisor expects list of strings
-        api_token = secrets.token_urlsafe(32)  # Generate secure API token
-
-        cur.execute(
-            "INSERT INTO apps (app_id, name, port, cwd, cmd, status, api_token, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-            (app_id, args.name, port, cwd, cmd_json, "running", api_token, now)
-        )
-        
-        conn.commit()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            # Find port
+            port = find_free_port(cur)
+
+            # Generate ID
+            # Simple ID from name + short hash to be subdomain-friendly
+            # e.g. "my-app" -> "my-app-a1b2"
+            safe_name = _SAFE_NAME_RE.sub("-", args.name.lower()).strip("-") or "app"
+            uid = str(uuid.uuid4())[:4]
+            app_id = f"{safe_name}-{uid}"
+
+            # Insert
+            now = iso_now()
+            cmd_json = json.dumps(args.cmd.split()) # Supervisor expects list of strings
+            api_token = os.urandom(32).hex()  # Secure API token (256 bits, hex: no base64 pass)
+
+            cur.execute(
+                "INSERT INTO apps (app_id, name, port, cwd, cmd, status, api_token, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (app_id, args.name, port, cwd, cmd_json, "running", api_token, now)
+            )
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
 
         # Supervisor (running in app.py) will pick this up automatically via DB polling.
         # Wait for the app to actually start listening on the assigned port.
@@ -127,8 +113,7 @@ def main():
 
         if not wait_for_port(port, timeout=15.0):
             # App didn't start on the assigned port - likely hardcoded port issue
-            cur.execute("DELETE FROM apps WHERE app_id = ?", (app_id,))
-            conn.commit()
+            cur.execute("DELETE FROM apps WHERE app_id = ?", (app_id,))  # autocommits
             conn.close()
             error_msg = (
                 f"App failed to start on assigned port {port}. "
@@ -7,26 +7,10 @@
 import sys
 import argparse
 import json
-import os
 import httpx
-from urllib.parse import urlparse
 
-API_BASE = "http://localhost:18000"
-
-
-def get_app_url(app_id: str) -> str:
-    """Generate app URL based on BASE_URL environment variable."""
-    base_url = os.getenv("BASE_URL", "http://localhost:18000")
-    parsed = urlparse(base_url)
-    scheme = parsed.scheme
-    host = parsed.hostname
-    port = parsed.port
-
-    if host in ("localhost", "127.0.0.1") or port:
-        port_suffix = f":{port}" if port else ":18000"
-        return f"http://{app_id}.lvh.me{port_suffix}/"
-
-    return f"{scheme}://{app_id}.{host}/"
+from _client import get_client
+from _url_utils import get_app_url
 
 
 def main():
@@ -37,7 +21,7 @@ def main():
     app_id = args.app_id
 
     try:
-        response = httpx.post(f"{API_BASE}/apps/{app_id}/__start", timeout=30)
+        response = get_client().post(f"/apps/{app_id}/__start")
 
         if response.status_code == 404:
             print(json.dumps({
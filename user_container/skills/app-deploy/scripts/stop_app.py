@@ -9,7 +9,7 @@ import argparse
 import json
 import httpx
 
-API_BASE = "http://localhost:18000"
+from _client import get_client
 
 
 def main():
@@ -20,7 +20,7 @@ def main():
     app_id = args.app_id
 
     try:
-        response = httpx.post(f"{API_BASE}/apps/{app_id}/__stop", timeout=30)
+        response = get_client().post(f"/apps/{app_id}/__stop")
 
         if response.status_code == 404:
             print(json.dumps({
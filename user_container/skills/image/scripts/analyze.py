@@ -1,5 +1,5 @@
 # /// script
-# dependencies = ["anthropic", "openai", "pillow"]
+# dependencies = ["anthropic", "openai"]
 # ///
 """
 Image Analysis Script
@@ -20,10 +20,27 @@ Examples:
 import argparse
 import base64
 import json
+import mmap
 import os
+from functools import lru_cache
 from pathlib import Path
 
+# Environment is fixed for the life of the process: read it once
+_PROVIDER = os.getenv("MODEL_PROVIDER", "anthropic")
+_ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929")
+_OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-5.2")
 
+_MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+_SUPPORTED_EXTENSIONS = frozenset(_MEDIA_TYPES)
+
+
+@lru_cache(maxsize=4)
 def get_api_key(provider: str) -> str:
     """
     Get API key from secrets file or environment.
@@ -51,21 +68,18 @@ def get_api_key(provider: str) -> str:
 
 def get_image_media_type(path: str) -> str:
     """Get media type from file extension."""
-    ext = Path(path).suffix.lower()
-    media_types = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".gif": "image/gif",
-        ".webp": "image/webp",
-    }
-    return media_types.get(ext, "image/jpeg")
+    return _MEDIA_TYPES.get(os.path.splitext(path)[1].lower(), "image/jpeg")
 
 
 def load_image_as_base64(path: str) -> str:
     """Load image file and return as base64 string."""
     with open(path, "rb") as f:
-        return base64.standard_b64encode(f.read()).decode("utf-8")
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        # Encode straight from the page cache instead of first copying
+        # the whole file (up to 20MB) into a bytes object
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.standard_b64encode(mm).decode("ascii")
 
 
 def analyze_with_anthropic(image_path: str, prompt: str) -> dict:
@@ -77,7 +91,7 @@ def analyze_with_anthropic(image_path: str, prompt: str) -> dict:
         return {"status": "error", "error": "ANTHROPIC_API_KEY not configured"}
 
     client = Anthropic(api_key=api_key)
-    model = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929")
+    model = _ANTHROPIC_MODEL
 
     image_data = load_image_as_base64(image_path)
     media_type = get_image_media_type(image_path)
@@ -127,7 +141,7 @@ def analyze_with_openai(image_path: str, prompt: str) -> dict:
         return {"status": "error", "error": "OPENAI_API_KEY not configured"}
 
     client = OpenAI(api_key=api_key)
-    model = os.getenv("OPENAI_MODEL", "gpt-5.2")
+    model = _OPENAI_MODEL
 
     image_data = load_image_as_base64(image_path)
     media_type = get_image_media_type(image_path)
@@ -191,15 +205,14 @@ def analyze_image(image_path: str, prompt: str) -> dict:
         }
 
     # Check supported formats
-    supported = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
-    if path.suffix.lower() not in supported:
+    if path.suffix.lower() not in _SUPPORTED_EXTENSIONS:
         return {
             "status": "error",
-            "error": f"Unsupported format: {path.suffix}. Supported: {', '.join(supported)}",
+            "error": f"Unsupported format: {path.suffix}. Supported: {', '.join(_MEDIA_TYPES)}",
         }
 
     # Determine provider from environment
-    provider = os.getenv("MODEL_PROVIDER", "anthropic")
+    provider = _PROVIDER
 
     try:
         if provider == "anthropic":
@@ -9,31 +9,205 @@ Returns dimensions, format, color mode, file size, and EXIF data.
 
 Usage:
     uv run info.py <image_path> [--exif]
+    uv run info.py --batch [--exif] [--jobs N] < paths.txt
 
 Options:
-    --exif  Include full EXIF data (camera settings, GPS, etc.)
+    --exif    Include full EXIF data (camera settings, GPS, etc.)
+    --batch   Read image paths from stdin (one per line), print one JSON result per line
+    --jobs N  With --batch, inspect images in N worker processes
 
 Examples:
     uv run info.py photo.jpg
     uv run info.py photo.jpg --exif
+    ls *.jpg | uv run info.py --batch
 """
 
 import json
 import os
+import struct
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+from math import gcd
 from pathlib import Path
 
-from PIL import Image
-from PIL.ExifTags import TAGS, GPSTAGS
+MODE_DESCRIPTIONS = {
+    "1": "Black and white (1-bit)",
+    "L": "Grayscale (8-bit)",
+    "P": "Palette (8-bit)",
+    "RGB": "RGB color (24-bit)",
+    "RGBA": "RGB with alpha (32-bit)",
+    "CMYK": "CMYK color",
+    "YCbCr": "YCbCr color",
+    "LAB": "LAB color",
+    "HSV": "HSV color",
+    "I": "Integer pixels (32-bit)",
+    "F": "Float pixels (32-bit)",
+}
+
+# Common useful EXIF fields for the quick summary
+EXIF_SUMMARY_TAGS = {
+    271: "camera_make",
+    272: "camera_model",
+    306: "date_taken",
+    37377: "shutter_speed",
+    37378: "aperture",
+    34855: "iso",
+    37386: "focal_length",
+}
+
+# PNG (color type, bit depth) -> Pillow mode
+_PNG_MODES = {
+    (0, 1): "1", (0, 2): "L", (0, 4): "L", (0, 8): "L",
+    (2, 8): "RGB",
+    (3, 1): "P", (3, 2): "P", (3, 4): "P", (3, 8): "P",
+    (4, 8): "LA",
+    (6, 8): "RGBA",
+}
+# JPEG component count -> Pillow mode
+_JPEG_MODES = {1: "L", 3: "RGB", 4: "CMYK"}
+# JPEG start-of-frame markers (SOF0-SOF15 minus DHT, JPG and DAC)
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _png_header(f) -> dict | None:
+    """Parse IHDR, then walk chunk headers (seeking over data) for acTL/fcTL/eXIf."""
+    f.seek(8)
+    length, ctype = struct.unpack(">I4s", f.read(8))
+    if ctype != b"IHDR":
+        return None
+    width, height, depth, color = struct.unpack(">IIBB", f.read(10))
+    mode = _PNG_MODES.get((color, depth))
+    if mode is None:
+        return None
+    n_frames = 1
+    apng = frame_control = idat = False
+    f.seek(8 + 8 + length + 4)
+    while True:
+        head = f.read(8)
+        if len(head) < 8:
+            break
+        length, ctype = struct.unpack(">I4s", head)
+        if ctype == b"acTL" and not idat:
+            if apng:
+                return None  # repeated acTL: invalid APNG, let Pillow decide
+            n_frames = struct.unpack(">I", f.read(4))[0]
+            if not 0 < n_frames <= 0x80000000:
+                return None
+            apng = True
+            length -= 4
+        elif ctype == b"fcTL":
+            frame_control = True
+        elif ctype == b"IDAT" and not idat:
+            idat = True
+            if apng and not frame_control:
+                # No fcTL before IDAT: the default image isn't part of the
+                # animation, and Pillow counts it as an extra frame
+                n_frames += 1
+        elif ctype == b"eXIf":
+            return None  # Pillow reads the EXIF summary
+        elif ctype == b"IEND":
+            break
+        f.seek(length + 4, os.SEEK_CUR)  # data + CRC
+    return {"format": "PNG", "width": width, "height": height, "mode": mode, "n_frames": n_frames}
+
+
+def _jpeg_header(f) -> dict | None:
+    """Walk JPEG marker segments up to the first SOFn."""
+    f.seek(2)
+    while True:
+        head = f.read(2)
+        if len(head) < 2 or head[0] != 0xFF:
+            return None
+        marker = head[1]
+        while marker == 0xFF:  # fill bytes
+            marker = f.read(1)[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            continue  # standalone markers carry no length
+        length = struct.unpack(">H", f.read(2))[0]
+        if marker in _JPEG_SOF:
+            _, height, width, components = struct.unpack(">BHHB", f.read(6))
+            mode = _JPEG_MODES.get(components)
+            if mode is None:
+                return None
+            return {"format": "JPEG", "width": width, "height": height, "mode": mode, "n_frames": 1}
+        if marker in (0xE1, 0xE2):
+            # APP1 Exif: Pillow reads the EXIF summary. APP2 MPF: multi-picture (MPO).
+            ident = f.read(4)
+            if ident in (b"Exif", b"MPF\x00"):
+                return None
+            length -= 4
+        elif marker == 0xDA:
+            return None  # scan data before any frame header
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _webp_header(f) -> dict | None:
+    """Read the first RIFF chunk (VP8, VP8L or VP8X) of a WebP file."""
+    f.seek(12)
+    chunk = f.read(8)
+    data = f.read(10)
+    if len(data) < 10:
+        return None
+    if chunk[:4] == b"VP8 ":
+        if data[3:6] != b"\x9d\x01\x2a":
+            return None
+        width, height = struct.unpack("<HH", data[6:10])
+        return {"format": "WEBP", "width": width & 0x3FFF, "height": height & 0x3FFF, "mode": "RGB", "n_frames": 1}
+    if chunk[:4] == b"VP8L":
+        if data[0] != 0x2F:
+            return None
+        bits = int.from_bytes(data[1:5], "little")
+        mode = "RGBA" if bits >> 28 & 1 else "RGB"
+        return {"format": "WEBP", "width": (bits & 0x3FFF) + 1, "height": (bits >> 14 & 0x3FFF) + 1, "mode": mode, "n_frames": 1}
+    if chunk[:4] == b"VP8X":
+        flags = data[0]
+        if flags & 0x0A:  # animation or EXIF: leave to Pillow
+            return None
+        width = int.from_bytes(data[4:7], "little") + 1
+        height = int.from_bytes(data[7:10], "little") + 1
+        mode = "RGBA" if flags & 0x10 else "RGB"
+        return {"format": "WEBP", "width": width, "height": height, "mode": mode, "n_frames": 1}
+    return None
+
+
+def read_image_header(path: Path) -> dict | None:
+    """
+    Read dimensions, format and mode from the file header without Pillow.
+
+    Covers PNG, JPEG and WebP files that carry no EXIF and a single frame.
+    Returns None for anything else (GIF, EXIF, animation, unusual modes) so
+    the caller falls back to Pillow.
+    """
+    try:
+        with open(path, "rb") as f:
+            magic = f.read(12)
+            if magic[:8] == b"\x89PNG\r\n\x1a\n":
+                return _png_header(f)
+            if magic[:3] == b"\xff\xd8\xff":
+                return _jpeg_header(f)
+            if magic[:4] == b"RIFF" and magic[8:12] == b"WEBP":
+                return _webp_header(f)
+    except (OSError, struct.error, IndexError):
+        pass
+    return None
+
+
+_NOT_READ = object()
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
+_JSON_SCALARS = (str, int, float, bool, type(None))
 
 
-def get_exif_data(image: Image.Image) -> dict:
-    """Extract EXIF data from image."""
+def get_exif_data(image, exif=_NOT_READ) -> dict:
+    """Extract EXIF data from image (or from its already-read _getexif() dict)."""
+    from PIL.ExifTags import TAGS, GPSTAGS
+
     exif_data = {}
 
     try:
-        exif = image._getexif()
+        if exif is _NOT_READ:
+            exif = image._getexif()
         if exif is None:
             return {}
 
@@ -49,12 +223,10 @@ def get_exif_data(image: Image.Image) -> dict:
                 exif_data["GPSInfo"] = gps_data
             else:
                 # Convert bytes and other non-serializable types to strings
+                # (decode with errors="ignore" cannot raise)
                 if isinstance(value, bytes):
-                    try:
-                        value = value.decode("utf-8", errors="ignore")
-                    except Exception:
-                        value = str(value)
-                elif not isinstance(value, (str, int, float, bool, type(None))):
+                    value = value.decode("utf-8", errors="ignore")
+                elif not isinstance(value, _JSON_SCALARS):
                     value = str(value)
 
                 exif_data[tag] = value
@@ -67,13 +239,75 @@ def get_exif_data(image: Image.Image) -> dict:
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human-readable format."""
-    for unit in ["B", "KB", "MB", "GB"]:
+    for unit in _SIZE_UNITS:
         if size_bytes < 1024:
             return f"{size_bytes:.1f} {unit}"
         size_bytes /= 1024
     return f"{size_bytes:.1f} TB"
 
 
+def _build_image_info(header: dict) -> dict:
+    """Assemble the image section from width/height/format/mode/n_frames."""
+    width, height = header["width"], header["height"]
+    divisor = gcd(width, height) or 1
+    return {
+        "width": width,
+        "height": height,
+        "format": header["format"],
+        "mode": header["mode"],
+        "mode_description": MODE_DESCRIPTIONS.get(header["mode"], header["mode"]),
+        "is_animated": header["n_frames"] > 1,
+        "n_frames": header["n_frames"],
+        "megapixels": round((width * height) / 1_000_000, 2),
+        "aspect_ratio": f"{width // divisor}:{height // divisor}",
+    }
+
+
+def _pillow_image_info(path: Path, include_exif: bool) -> dict:
+    """Image section via Pillow, for formats the header parser leaves alone."""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        image_info = _build_image_info({
+            "width": img.width,
+            "height": img.height,
+            "format": img.format,
+            "mode": img.mode,
+            "n_frames": getattr(img, "n_frames", 1),
+        })
+        image_info["is_animated"] = getattr(img, "is_animated", False)
+
+        # Parse EXIF once for both the full dump and the quick summary
+        exif_error = None
+        try:
+            exif = img._getexif()
+        except Exception as e:
+            exif, exif_error = None, str(e)
+
+        # EXIF data
+        if include_exif:
+            exif_data = {"_error": exif_error} if exif_error else get_exif_data(img, exif)
+            if exif_data:
+                image_info["exif"] = exif_data
+
+        # Quick EXIF summary (always included if available)
+        try:
+            if exif:
+                quick_exif = {}
+                for tag_id, key in EXIF_SUMMARY_TAGS.items():
+                    if tag_id in exif:
+                        value = exif[tag_id]
+                        if isinstance(value, bytes):
+                            value = value.decode("utf-8", errors="ignore")
+                        quick_exif[key] = str(value)
+                if quick_exif:
+                    image_info["exif_summary"] = quick_exif
+        except Exception:
+            pass
+
+    return image_info
+
+
 def get_image_info(image_path: str, include_exif: bool = False) -> dict:
     """
     Get image metadata.
@@ -87,12 +321,14 @@ def get_image_info(image_path: str, include_exif: bool = False) -> dict:
     """
     path = Path(image_path)
 
-    if not path.exists():
+    # One stat serves both the existence check and the file info
+    try:
+        stat = os.stat(image_path)
+    except FileNotFoundError:
         return {"status": "error", "error": f"File not found: {image_path}"}
 
     try:
         # File system info
-        stat = path.stat()
         file_info = {
             "filename": path.name,
             "path": str(path.absolute()),
@@ -101,70 +337,12 @@ def get_image_info(image_path: str, include_exif: bool = False) -> dict:
             "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
         }
 
-        # Image info
-        with Image.open(path) as img:
-            image_info = {
-                "width": img.width,
-                "height": img.height,
-                "format": img.format,
-                "mode": img.mode,
-                "mode_description": {
-                    "1": "Black and white (1-bit)",
-                    "L": "Grayscale (8-bit)",
-                    "P": "Palette (8-bit)",
-                    "RGB": "RGB color (24-bit)",
-                    "RGBA": "RGB with alpha (32-bit)",
-                    "CMYK": "CMYK color",
-                    "YCbCr": "YCbCr color",
-                    "LAB": "LAB color",
-                    "HSV": "HSV color",
-                    "I": "Integer pixels (32-bit)",
-                    "F": "Float pixels (32-bit)",
-                }.get(img.mode, img.mode),
-                "is_animated": getattr(img, "is_animated", False),
-                "n_frames": getattr(img, "n_frames", 1),
-            }
-
-            # Calculate megapixels
-            megapixels = (img.width * img.height) / 1_000_000
-            image_info["megapixels"] = round(megapixels, 2)
-
-            # Aspect ratio
-            from math import gcd
-            divisor = gcd(img.width, img.height)
-            image_info["aspect_ratio"] = f"{img.width // divisor}:{img.height // divisor}"
-
-            # EXIF data
-            if include_exif:
-                exif = get_exif_data(img)
-                if exif:
-                    image_info["exif"] = exif
-
-            # Quick EXIF summary (always included if available)
-            try:
-                exif = img._getexif()
-                if exif:
-                    quick_exif = {}
-                    # Common useful EXIF fields
-                    exif_mapping = {
-                        271: "camera_make",
-                        272: "camera_model",
-                        306: "date_taken",
-                        37377: "shutter_speed",
-                        37378: "aperture",
-                        34855: "iso",
-                        37386: "focal_length",
-                    }
-                    for tag_id, key in exif_mapping.items():
-                        if tag_id in exif:
-                            value = exif[tag_id]
-                            if isinstance(value, bytes):
-                                value = value.decode("utf-8", errors="ignore")
-                            quick_exif[key] = str(value)
-                    if quick_exif:
-                        image_info["exif_summary"] = quick_exif
-            except Exception:
-                pass
+        # Image info: header-only parse, Pillow (and EXIF) only when needed
+        header = None if include_exif else read_image_header(path)
+        if header is not None:
+            image_info = _build_image_info(header)
+        else:
+            image_info = _pillow_image_info(path, include_exif)
 
         return {
             "status": "success",
@@ -176,23 +354,60 @@ def get_image_info(image_path: str, include_exif: bool = False) -> dict:
         return {"status": "error", "error": str(e)}
 
 
+def run_batch(include_exif: bool, jobs: int = 1) -> None:
+    """Print get_image_info() for every path on stdin as one JSON line each.
+
+    One interpreter serves the whole batch; --jobs spreads it over processes.
+    """
+    paths = [line.strip() for line in sys.stdin if line.strip()]
+    inspect = partial(get_image_info, include_exif=include_exif)
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        results = pool.map(inspect, paths, chunksize=16) if pool else map(inspect, paths)
+        for path, result in zip(paths, results):
+            print(json.dumps({"input": path, **result}, ensure_ascii=False))
+    finally:
+        if pool:
+            pool.shutdown()
+
+
+def print_usage() -> None:
+    print("Usage: uv run info.py <image_path> [--exif]")
+    print("       uv run info.py --batch [--exif] [--jobs N] < paths.txt")
+    print()
+    print("Extract metadata from image files.")
+    print()
+    print("Options:")
+    print("  --exif    Include full EXIF data (camera, GPS, etc.)")
+    print("  --batch   Read paths from stdin, print one JSON result per line")
+    print("  --jobs N  With --batch, use N worker processes")
+    print()
+    print("Examples:")
+    print("  uv run info.py photo.jpg")
+    print("  uv run info.py photo.jpg --exif")
+    print("  ls *.jpg | uv run info.py --batch")
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: uv run info.py <image_path> [--exif]")
-        print()
-        print("Extract metadata from image files.")
-        print()
-        print("Options:")
-        print("  --exif  Include full EXIF data (camera, GPS, etc.)")
-        print()
-        print("Examples:")
-        print("  uv run info.py photo.jpg")
-        print("  uv run info.py photo.jpg --exif")
+        print_usage()
         sys.exit(1)
 
-    image_path = sys.argv[1]
     include_exif = "--exif" in sys.argv
 
+    if "--batch" in sys.argv:
+        jobs = 1
+        if "--jobs" in sys.argv:
+            try:
+                jobs = int(sys.argv[sys.argv.index("--jobs") + 1])
+            except (IndexError, ValueError):
+                print_usage()
+                sys.exit(1)
+        run_batch(include_exif, jobs)
+        return
+
+    image_path = sys.argv[1]
+
     result = get_image_info(image_path, include_exif)
     print(json.dumps(result, indent=2, ensure_ascii=False))
 
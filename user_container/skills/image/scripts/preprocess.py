@@ -17,8 +17,11 @@ Options:
     --crop X,Y,W,H      Crop region (x, y, width, height)
     --format FORMAT     Convert to format (jpeg, png, webp)
     --quality Q         JPEG/WebP quality 1-100 (default: 85)
+    --webp-method M     WebP encoder effort 0 (fastest) - 6 (smallest) (default: 4)
     --grayscale         Convert to grayscale
     --enhance           Auto-enhance (contrast, sharpness)
+    --cache             Reuse decoded pixels across runs on the same input
+    --prefer-webp       With --max-mb, write WebP (lossless for screenshots/graphics if it fits)
 
 Examples:
     uv run preprocess.py large.png small.jpg --max-size 2048
@@ -27,11 +30,135 @@ Examples:
     uv run preprocess.py huge.png compressed.jpg --max-mb 5
 """
 
+import base64
+import hashlib
+import io
 import json
+import mmap
+import os
+import shutil
+import struct
 import sys
 from pathlib import Path
 
-from PIL import Image, ImageEnhance, ImageOps
+from PIL import Image, ImageEnhance, ImageOps, ImageStat
+
+# Optional: libvips streams decode -> shrink -> encode for plain --max-size
+# downscales (e.g. `uv run --with pyvips preprocess.py ...`)
+try:
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
+_VIPS_LOADERS = ("jpegload", "pngload", "webpload")
+_VIPS_MODES = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA"}
+
+# --cache: decoded pixels keyed by input path + mtime + size, so repeated runs
+# on one source (e.g. trying settings) skip the JPEG/PNG decode
+DECODE_CACHE_DIR = Path("/tmp/zeno_decode_cache")
+DECODE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # entries are raw full-size pixels
+_CACHE_HEADER = struct.Struct(">4sII8sI")  # magic, width, height, mode, info length
+_CACHE_MAGIC = b"ZDC2"
+# img.info keys that change how the output is written (PNG/JPEG/WebP save
+# read them from info); kept with the pixels so a hit saves identically
+_CACHED_INFO_KEYS = ("icc_profile", "transparency", "dpi")
+
+# Every 8-bit value once: blending it gives an exact per-value lookup table
+_RAMP = Image.frombytes("L", (256, 1), bytes(range(256)))
+
+
+def _decode_cache_path(path: Path) -> Path:
+    st = path.stat()
+    key = f"{path.resolve()}:{st.st_mtime_ns}:{st.st_size}"
+    return DECODE_CACHE_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.raw"
+
+
+def _prune_decode_cache() -> None:
+    """Drop least recently used entries once the cache exceeds DECODE_CACHE_MAX_BYTES."""
+    entries = []
+    for entry in DECODE_CACHE_DIR.glob("*.raw"):
+        try:
+            entries.append((entry.stat(), entry))
+        except FileNotFoundError:
+            continue
+    entries.sort(key=lambda item: item[0].st_mtime, reverse=True)
+    total = 0
+    for st, entry in entries:
+        total += st.st_size
+        if total > DECODE_CACHE_MAX_BYTES:
+            entry.unlink(missing_ok=True)
+
+
+def _encode_cached_info(info: dict) -> bytes:
+    """Serialize the _CACHED_INFO_KEYS of img.info as JSON (ICC profile base64-encoded)."""
+    kept = {}
+    for key in _CACHED_INFO_KEYS:
+        if key not in info:
+            continue
+        value = info[key]
+        if key == "icc_profile":
+            if not value:
+                continue
+            value = base64.b64encode(value).decode("ascii")
+        kept[key] = value
+    return json.dumps(kept).encode() if kept else b""
+
+
+def _decode_cached_info(data: bytes) -> dict:
+    """Inverse of _encode_cached_info."""
+    if not data:
+        return {}
+    info = json.loads(data)
+    if "icc_profile" in info:
+        info["icc_profile"] = base64.b64decode(info["icc_profile"])
+    for key in ("transparency", "dpi"):
+        if isinstance(info.get(key), list):
+            info[key] = tuple(info[key])
+    return info
+
+
+def open_cached(path: Path) -> Image.Image:
+    """
+    Open an image through the on-disk decode cache.
+
+    A hit maps the stored raw pixels instead of decoding the file. A miss
+    decodes normally and stores the pixels together with the info entries
+    that affect saving (ICC profile, transparency, dpi). Palette images are
+    not cached (raw bytes would lose the palette).
+    """
+    cache_path = _decode_cache_path(path)
+    try:
+        with open(cache_path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, width, height, mode, info_len = _CACHE_HEADER.unpack_from(mm)
+        if magic == _CACHE_MAGIC:
+            mode = mode.rstrip(b"\0").decode("ascii")
+            pixels_at = _CACHE_HEADER.size + info_len
+            info = _decode_cached_info(mm[_CACHE_HEADER.size:pixels_at])
+            os.utime(cache_path)  # mark as recently used
+            img = Image.frombuffer(mode, (width, height), memoryview(mm)[pixels_at:], "raw", mode, 0, 1)
+            img.info.update(info)
+            return img
+    except (OSError, ValueError, struct.error):
+        pass
+
+    img = Image.open(path)
+    img.load()
+    if img.mode in ("P", "PA"):
+        return img
+    try:
+        DECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        info = _encode_cached_info(img.info)
+        with open(tmp, "wb") as f:
+            f.write(_CACHE_HEADER.pack(_CACHE_MAGIC, img.width, img.height, img.mode.encode("ascii"), len(info)))
+            f.write(info)
+            f.write(img.tobytes())
+        os.replace(tmp, cache_path)
+        _prune_decode_cache()
+    except OSError:
+        pass
+    return img
 
 
 def resize_to_dimensions(img: Image.Image, width: int, height: int) -> Image.Image:
@@ -49,11 +176,67 @@ def resize_max_dimension(img: Image.Image, max_size: int) -> Image.Image:
     return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
 
 
+def vips_resize_max_dimension(
+    input_path: str, output_path: str, max_size: int, quality: int, webp_method: int = 4
+) -> dict | None:
+    """
+    Resize keeping aspect ratio with libvips, straight from file to file.
+
+    Returns size/mode info for input and output, or None when the input
+    isn't an 8-bit sRGB/grayscale JPEG, PNG or WebP (caller uses Pillow).
+    Also None when Pillow would decode it to another mode (palette or tRNS
+    PNGs, which libvips expands to RGB/alpha), so both paths agree.
+    """
+    try:
+        src = pyvips.Image.new_from_file(input_path, access="sequential")
+    except pyvips.Error:
+        return None  # e.g. BMP/ICO without libvips' magick loader
+    if (
+        src.get("vips-loader") not in _VIPS_LOADERS
+        or src.interpretation not in ("srgb", "b-w")
+        or src.format != "uchar"
+    ):
+        return None
+    with Image.open(input_path) as probe:  # header only, no decode
+        if probe.mode != _VIPS_MODES.get(src.bands) or "transparency" in probe.info:
+            return None
+    original = {"size": (src.width, src.height), "mode": _VIPS_MODES.get(src.bands)}
+
+    # thumbnail() shrinks on load where the format allows it; never upscales.
+    # no_rotate: Pillow doesn't apply the EXIF orientation either
+    img = pyvips.Image.thumbnail(input_path, max_size, height=max_size, size="down", no_rotate=True)
+
+    fmt = Path(output_path).suffix.lower()
+    if fmt in (".jpg", ".jpeg"):
+        if img.hasalpha():
+            img = img.extract_band(0, n=img.bands - 1)  # JPEG doesn't support alpha
+        img.write_to_file(output_path, Q=quality, optimize_coding=True)
+    elif fmt == ".webp":
+        img.write_to_file(output_path, Q=quality, effort=webp_method)
+    else:
+        img.write_to_file(output_path, compression=9)  # like Pillow's optimize=True
+
+    return {"input": original, "output": {"size": (img.width, img.height), "mode": _VIPS_MODES.get(img.bands)}}
+
+
 def crop_region(img: Image.Image, x: int, y: int, width: int, height: int) -> Image.Image:
     """Crop a region from image."""
     return img.crop((x, y, x + width, y + height))
 
 
+def boost_contrast(img: Image.Image, factor: float) -> Image.Image:
+    """
+    Same result as ImageEnhance.Contrast(img).enhance(factor) for L/RGB images.
+
+    Contrast blends with a full-size mean-gray image; blending only the 256
+    possible values instead gives a LUT, applied in a single point() pass.
+    """
+    gray = img if img.mode == "L" else img.convert("L")
+    mean = int(ImageStat.Stat(gray).mean[0] + 0.5)
+    lut = Image.blend(Image.new("L", (256, 1), mean), _RAMP, factor).tobytes()
+    return img.point(list(lut) * len(img.getbands()))
+
+
 def enhance_image(img: Image.Image) -> Image.Image:
     """Auto-enhance image (contrast, sharpness, color)."""
     # Auto contrast
@@ -64,14 +247,39 @@ def enhance_image(img: Image.Image) -> Image.Image:
     img = enhancer.enhance(1.2)
 
     # Slight contrast boost
-    enhancer = ImageEnhance.Contrast(img)
-    img = enhancer.enhance(1.1)
+    img = boost_contrast(img, 1.1)
 
     return img
 
 
-def save_with_max_size(img: Image.Image, output_path: str, max_mb: float, initial_quality: int = 85) -> int:
-    """Save image, reducing quality until under max_mb. Returns final quality used."""
+def looks_like_screen_content(img: Image.Image) -> bool:
+    """
+    Guess whether an image is a screenshot/diagram rather than a photo.
+
+    Flat UI and graphics use few distinct colors; a nearest-neighbour
+    128px sample of a photo (even a grayscale one) almost always has more
+    than 128. A wrong guess only costs one lossless encode attempt.
+    """
+    # Sample first: NEAREST only picks pixels, so converting afterwards gives
+    # the same colors without an RGB copy of the full-resolution image
+    sample = img.resize((128, 128), Image.Resampling.NEAREST).convert("RGB")
+    return sample.getcolors(maxcolors=128) is not None
+
+
+def save_with_max_size(
+    img: Image.Image,
+    output_path: str,
+    max_mb: float,
+    initial_quality: int = 85,
+    webp_method: int = 4,
+    try_lossless: bool = False,
+) -> int:
+    """
+    Save image, reducing quality until under max_mb. Returns final quality used.
+
+    With try_lossless, WebP output of screen content is first tried
+    lossless (reported as quality 100) before falling back to lossy.
+    """
     max_bytes = max_mb * 1024 * 1024
     quality = initial_quality
     path = Path(output_path)
@@ -87,15 +295,110 @@ def save_with_max_size(img: Image.Image, output_path: str, max_mb: float, initia
         img.save(output_path, optimize=True)
         return 100
 
-    while quality >= 10:
-        img.save(output_path, format=save_format, quality=quality, optimize=True)
-        if path.stat().st_size <= max_bytes:
-            return quality
-        quality -= 5
-
+    # optimize (Huffman tables) is worth its ~25% encode cost here: size is the goal.
+    # Baseline, not progressive: progressive encodes are ~2-3x slower per probe.
+    save_kwargs = {"format": save_format, "optimize": True}
+    if save_format == "WebP":
+        save_kwargs["method"] = webp_method
+
+        if try_lossless and looks_like_screen_content(img):
+            buf = io.BytesIO()
+            img.save(buf, format="WebP", lossless=True, method=webp_method)
+            if buf.tell() <= max_bytes:
+                path.write_bytes(buf.getbuffer())
+                return 100
+
+    def encode(q: int) -> io.BytesIO:
+        buf = io.BytesIO()
+        img.save(buf, quality=q, **save_kwargs)
+        return buf
+
+    # Probes are encoded in memory and measured with tell(); only the chosen
+    # buffer is written out. Most images fit at the requested quality, so
+    # that first attempt is already the final encode.
+    buf = encode(quality)
+    if buf.tell() > max_bytes:
+        if save_format == "WebP":
+            # Bisect with the fastest WebP method; the chosen quality is
+            # re-encoded with webp_method below
+            save_kwargs["method"] = 0
+        # Bisect for the highest quality that fits (size grows with quality)
+        floor = min(10, quality)
+        lo, hi = floor, quality - 1
+        best = floor_buf = None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            candidate = encode(mid)
+            if candidate.tell() <= max_bytes:
+                best, lo = (mid, candidate), mid + 1
+            else:
+                if mid == floor:
+                    floor_buf = candidate
+                hi = mid - 1
+        # Nothing fits: fall back to the lowest quality
+        quality, buf = best or (floor, floor_buf or encode(floor))
+
+        if save_format == "WebP" and webp_method != 0:
+            # Higher methods are normally smaller at the same quality; keep the
+            # probe if this one happens not to fit
+            save_kwargs["method"] = webp_method
+            final = encode(quality)
+            if final.tell() <= max(max_bytes, buf.tell()):
+                buf = final
+
+    path.write_bytes(buf.getbuffer())
     return quality
 
 
+def _same_format(a: Path, b: Path) -> bool:
+    """True if both paths have the same image file extension (.jpg == .jpeg)."""
+    def norm(p: Path) -> str:
+        ext = p.suffix.lower()
+        return ".jpg" if ext == ".jpeg" else ext
+    return norm(a) == norm(b)
+
+
+def _build_result(
+    path: Path,
+    out_path: Path,
+    input_info: dict,
+    output_info: dict,
+    final_quality: int,
+    crop: str,
+    resize: str,
+    max_size: int,
+    grayscale: bool,
+    enhance: bool,
+    max_mb: float,
+) -> dict:
+    """Success result shared by the Pillow and libvips paths."""
+    output_stat = out_path.stat()
+
+    return {
+        "status": "success",
+        "input": {
+            "path": str(path.absolute()),
+            "size": input_info["size"],
+            "mode": input_info["mode"],
+        },
+        "output": {
+            "path": str(out_path.absolute()),
+            "size": output_info["size"],
+            "mode": output_info["mode"],
+            "file_size_bytes": output_stat.st_size,
+            "file_size_mb": round(output_stat.st_size / (1024 * 1024), 2),
+            "quality": final_quality if out_path.suffix.lower() in [".jpg", ".jpeg", ".webp"] else None,
+        },
+        "operations": {
+            "cropped": crop is not None,
+            "resized": resize is not None or max_size is not None,
+            "grayscale": grayscale,
+            "enhanced": enhance,
+            "compressed": max_mb is not None,
+        },
+    }
+
+
 def preprocess_image(
     input_path: str,
     output_path: str,
@@ -107,6 +410,9 @@ def preprocess_image(
     quality: int = 85,
     grayscale: bool = False,
     enhance: bool = False,
+    webp_method: int = 4,
+    cache: bool = False,
+    prefer_webp: bool = False,
 ) -> dict:
     """
     Preprocess an image file.
@@ -122,6 +428,9 @@ def preprocess_image(
         quality: JPEG/WebP quality 1-100
         grayscale: Convert to grayscale
         enhance: Auto-enhance image
+        webp_method: WebP encoder effort 0 (fastest) - 6 (smallest)
+        cache: Reuse decoded pixels from DECODE_CACHE_DIR across runs
+        prefer_webp: With max_mb, write WebP (output suffix becomes .webp)
 
     Returns:
         dict with status and output info
@@ -132,12 +441,56 @@ def preprocess_image(
         return {"status": "error", "error": f"File not found: {input_path}"}
 
     try:
-        img = Image.open(path)
+        out_path = Path(output_path)
+        if prefer_webp and max_mb and out_path.suffix.lower() != ".webp":
+            # Usually far fewer bytes than JPEG/PNG at the same visual quality
+            out_path = out_path.with_suffix(".webp")
+            output_path = str(out_path)
+
+        # Only --max-mb, same format, already within budget: nothing to
+        # re-encode, copy the file as is
+        if (
+            max_mb
+            and not (resize or crop or max_size or grayscale or enhance)
+            and _same_format(path, out_path)
+            and path.stat().st_size <= max_mb * 1024 * 1024
+        ):
+            with Image.open(path) as img:
+                info = {"size": (img.width, img.height), "mode": img.mode}
+            if not (out_path.exists() and out_path.samefile(path)):
+                shutil.copyfile(path, out_path)
+            return _build_result(
+                path, out_path, info, info, None,
+                crop, resize, max_size, grayscale, enhance, max_mb,
+            )
+
+        # Plain downscale: let libvips run the whole pipeline when available
+        if (
+            pyvips is not None
+            and max_size
+            and not (resize or crop or grayscale or enhance or max_mb)
+            and out_path.suffix.lower() in (".jpg", ".jpeg", ".png", ".webp")
+        ):
+            vips = vips_resize_max_dimension(input_path, output_path, max_size, quality, webp_method)
+            if vips is not None:
+                return _build_result(
+                    path, out_path, vips["input"], vips["output"], quality,
+                    crop, resize, max_size, grayscale, enhance, max_mb,
+                )
+
+        img = open_cached(path) if cache else Image.open(path)
         original_size = (img.width, img.height)
         original_mode = img.mode
 
+        # JPEG shrink-on-load: let libjpeg's DCT scaling (1/2, 1/4, 1/8) decode
+        # close to 2x the target, so Lanczos only handles the last step.
+        # Not with crop/resize, whose coordinates refer to the full image.
+        if max_size and not (crop or resize) and img.format == "JPEG":
+            ratio = 2 * max_size / max(img.width, img.height)
+            if ratio < 1:
+                img.draft(None, (int(img.width * ratio), int(img.height * ratio)))
+
         # Convert to RGB if saving as JPEG (JPEG doesn't support alpha)
-        out_path = Path(output_path)
         if out_path.suffix.lower() in [".jpg", ".jpeg"] and img.mode in ["RGBA", "P"]:
             img = img.convert("RGB")
 
@@ -167,19 +520,15 @@ def preprocess_image(
 
         # 4. Enhance
         if enhance:
-            # Convert back to RGB for enhancement if grayscale
-            if img.mode == "L":
+            # Autocontrast/sharpness/contrast all work on L directly: grayscale
+            # images are enhanced in place instead of round-tripping via RGB
+            if img.mode not in ("L", "RGB"):
                 img = img.convert("RGB")
-                img = enhance_image(img)
-                img = img.convert("L")
-            else:
-                if img.mode != "RGB":
-                    img = img.convert("RGB")
-                img = enhance_image(img)
+            img = enhance_image(img)
 
         # 5. Save
         if max_mb:
-            final_quality = save_with_max_size(img, output_path, max_mb, quality)
+            final_quality = save_with_max_size(img, output_path, max_mb, quality, webp_method, try_lossless=prefer_webp)
         else:
             # Determine format
             fmt = out_path.suffix.lower()
@@ -191,38 +540,19 @@ def preprocess_image(
             elif fmt == ".webp":
                 save_kwargs["format"] = "WebP"
                 save_kwargs["quality"] = quality
+                save_kwargs["method"] = webp_method
             elif fmt == ".png":
                 save_kwargs["format"] = "PNG"
 
             img.save(output_path, **save_kwargs)
             final_quality = quality
 
-        # Get output info
-        output_stat = out_path.stat()
-
-        return {
-            "status": "success",
-            "input": {
-                "path": str(path.absolute()),
-                "size": original_size,
-                "mode": original_mode,
-            },
-            "output": {
-                "path": str(out_path.absolute()),
-                "size": (img.width, img.height),
-                "mode": img.mode,
-                "file_size_bytes": output_stat.st_size,
-                "file_size_mb": round(output_stat.st_size / (1024 * 1024), 2),
-                "quality": final_quality if out_path.suffix.lower() in [".jpg", ".jpeg", ".webp"] else None,
-            },
-            "operations": {
-                "cropped": crop is not None,
-                "resized": resize is not None or max_size is not None,
-                "grayscale": grayscale,
-                "enhanced": enhance,
-                "compressed": max_mb is not None,
-            },
-        }
+        return _build_result(
+            path, out_path,
+            {"size": original_size, "mode": original_mode},
+            {"size": (img.width, img.height), "mode": img.mode},
+            final_quality, crop, resize, max_size, grayscale, enhance, max_mb,
+        )
 
     except Exception as e:
         return {"status": "error", "error": str(e)}
@@ -241,8 +571,11 @@ def main():
         print("  --crop X,Y,W,H      Crop region")
         print("  --format FORMAT     Output format (jpeg, png, webp)")
         print("  --quality Q         JPEG/WebP quality 1-100 (default: 85)")
+        print("  --webp-method M     WebP effort 0-6, higher = smaller/slower (default: 4)")
         print("  --grayscale         Convert to grayscale")
         print("  --enhance           Auto-enhance image")
+        print("  --cache             Reuse decoded pixels across runs on the same input")
+        print("  --prefer-webp       With --max-mb, write WebP instead (output renamed to .webp)")
         print()
         print("Examples:")
         print("  uv run preprocess.py large.png small.jpg --max-size 2048")
@@ -260,8 +593,11 @@ def main():
     crop = None
     output_format = None
     quality = 85
+    webp_method = 4
     grayscale = False
     enhance = False
+    cache = False
+    prefer_webp = False
 
     i = 3
     while i < len(sys.argv):
@@ -284,12 +620,21 @@ def main():
         elif arg == "--quality" and i + 1 < len(sys.argv):
             quality = int(sys.argv[i + 1])
             i += 2
+        elif arg == "--webp-method" and i + 1 < len(sys.argv):
+            webp_method = int(sys.argv[i + 1])
+            i += 2
         elif arg == "--grayscale":
             grayscale = True
             i += 1
         elif arg == "--enhance":
             enhance = True
             i += 1
+        elif arg == "--cache":
+            cache = True
+            i += 1
+        elif arg == "--prefer-webp":
+            prefer_webp = True
+            i += 1
         else:
             i += 1
 
@@ -304,6 +649,9 @@ def main():
         quality=quality,
         grayscale=grayscale,
         enhance=enhance,
+        webp_method=webp_method,
+        cache=cache,
+        prefer_webp=prefer_webp,
     )
     print(json.dumps(result, indent=2, ensure_ascii=False))
 
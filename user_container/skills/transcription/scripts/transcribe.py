@@ -1,5 +1,5 @@
 # /// script
-# dependencies = ["openai"]
+# dependencies = ["openai", "httpx[http2]"]
 # ///
 """
 Transcription Script using OpenAI GPT-4o Transcribe API
@@ -25,15 +25,33 @@ Examples:
 """
 
 import argparse
+import asyncio
+import csv
 import json
 import os
+import shutil
+import subprocess
 import sys
+import tempfile
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 
+MAX_UPLOAD_MB = 25  # API limit
+# Mono 24 kbps Opus keeps speech intelligible at ~11MB per hour
+COMPRESS_ARGS = ("-vn", "-ac", "1", "-c:a", "libopus", "-b:a", "24k")
+# Compressed audio is cut into chunks of this length (~3.5MB each at 24 kbps),
+# transcribed concurrently. The gpt-4o transcribe models reject requests over
+# ~1500 s of audio, so chunks stay well below that, not just below 25MB.
+CHUNK_SECONDS = 1200
 
+
+@lru_cache(maxsize=1)
 def get_api_key() -> str:
     """
     Get OpenAI API key from secrets file or environment.
+
+    Cached: secrets.json is read at most once per process.
     """
     secrets_file = Path("/app/secrets.json")
 
@@ -81,9 +99,10 @@ def transcribe(
     if not path.exists():
         return {"status": "error", "error": f"File not found: {audio_path}"}
 
-    # Check file size (API limit is 25MB)
+    # Check file size (API limit is 25MB); larger files are compressed
+    # before upload when ffmpeg is available
     file_size_mb = path.stat().st_size / (1024 * 1024)
-    if file_size_mb > 25:
+    if file_size_mb > MAX_UPLOAD_MB and not shutil.which("ffmpeg"):
         return {
             "status": "error",
             "error": f"File too large: {file_size_mb:.1f}MB (max 25MB). Compress or split the file.",
@@ -125,18 +144,16 @@ def transcribe(
         if diarize:
             # Use diarization model
             model_name = "gpt-4o-transcribe-diarize"
-            with open(audio_path, "rb") as audio_file:
-                kwargs = {
-                    "model": model_name,
-                    "file": audio_file,
-                    "response_format": "diarized_json",
-                    "chunking_strategy": "auto",
-                }
+            kwargs = {
+                "model": model_name,
+                "response_format": "diarized_json",
+                "chunking_strategy": "auto",
+            }
 
-                if language:
-                    kwargs["language"] = language
+            if language:
+                kwargs["language"] = language
 
-                response = client.audio.transcriptions.create(**kwargs)
+            response = _create_transcription(client, audio_path, kwargs)
 
             # Build result with speaker segments
             result = {
@@ -160,6 +177,14 @@ def transcribe(
                     for seg in response.segments
                 ]
 
+            chunks = getattr(response, "chunks", 1)
+            if chunks > 1:
+                result["note"] = (
+                    f"Long recording transcribed in {chunks} chunks. Speaker labels are "
+                    "per chunk (\"2:A\" = speaker A in chunk 2) and are not matched "
+                    "across chunks."
+                )
+
             return result
 
         else:
@@ -168,19 +193,17 @@ def transcribe(
             # Determine response format for API
             response_format = "verbose_json" if timestamps or output_format in ["srt", "vtt"] else "json"
 
-            with open(audio_path, "rb") as audio_file:
-                kwargs = {
-                    "model": model_name,
-                    "file": audio_file,
-                    "response_format": response_format,
-                }
+            kwargs = {
+                "model": model_name,
+                "response_format": response_format,
+            }
 
-                if language:
-                    kwargs["language"] = language
-                if prompt:
-                    kwargs["prompt"] = prompt
+            if language:
+                kwargs["language"] = language
+            if prompt:
+                kwargs["prompt"] = prompt
 
-                response = client.audio.transcriptions.create(**kwargs)
+            response = _create_transcription(client, audio_path, kwargs)
 
             usage = _extract_usage(response)
 
@@ -232,6 +255,116 @@ def transcribe(
         return {"status": "error", "error": str(e)}
 
 
+def _create_transcription(client, audio_path: str, kwargs: dict):
+    """
+    Upload audio_path to the transcription endpoint.
+
+    The file object goes to the SDK as-is: httpx streams multipart file
+    fields from disk in 64 KiB chunks. A Path or bytes would instead be
+    read whole into memory before the request is sent. Files over the
+    upload limit are first re-encoded to temporary Opus chunks; several
+    chunks are uploaded concurrently and their results merged.
+    """
+    if os.path.getsize(audio_path) > MAX_UPLOAD_MB * 1024 * 1024:
+        with tempfile.TemporaryDirectory() as tmp:
+            chunks = _compress_audio(audio_path, tmp)
+            if len(chunks) > 1:
+                return asyncio.run(_transcribe_chunks(client.api_key, chunks, kwargs))
+            with open(chunks[0][0], "rb") as audio_file:
+                return client.audio.transcriptions.create(file=audio_file, **kwargs)
+
+    with open(audio_path, "rb") as audio_file:
+        return client.audio.transcriptions.create(file=audio_file, **kwargs)
+
+
+def _compress_audio(audio_path: str, out_dir: str) -> list[tuple[str, float]]:
+    """
+    Re-encode audio_path as mono low-bitrate Opus in out_dir with ffmpeg.
+
+    Returns (chunk_path, start_seconds) pairs, one per CHUNK_SECONDS of audio.
+    """
+    chunk_list = os.path.join(out_dir, "chunks.csv")
+    proc = subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-v", "error", "-y", "-i", audio_path, *COMPRESS_ARGS,
+            "-f", "segment", "-segment_time", str(CHUNK_SECONDS),
+            "-segment_list", chunk_list, "-segment_list_type", "csv",
+            os.path.join(out_dir, "chunk%03d.ogg"),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not compress {audio_path}: {proc.stderr.strip()}")
+
+    with open(chunk_list, newline="") as f:
+        chunks = [(os.path.join(out_dir, name), float(start)) for name, start, _end in csv.reader(f)]
+
+    for chunk_path, _start in chunks:
+        size_mb = os.path.getsize(chunk_path) / (1024 * 1024)
+        if size_mb > MAX_UPLOAD_MB:
+            raise RuntimeError(
+                f"File too large even after compression: {size_mb:.1f}MB (max 25MB). Split the file."
+            )
+    return chunks
+
+
+async def _transcribe_chunks(api_key: str, chunks: list[tuple[str, float]], kwargs: dict):
+    """Transcribe all chunks concurrently over one HTTP/2 connection and merge them."""
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    async with AsyncOpenAI(
+        api_key=api_key, http_client=DefaultAsyncHttpxClient(http2=True)
+    ) as client:
+
+        async def _transcribe_one(chunk_path: str):
+            with open(chunk_path, "rb") as audio_file:
+                return await client.audio.transcriptions.create(file=audio_file, **kwargs)
+
+        responses = await asyncio.gather(*[_transcribe_one(path) for path, _start in chunks])
+
+    return _merge_chunk_responses(responses, [start for _path, start in chunks])
+
+
+def _merge_chunk_responses(responses: list, offsets: list[float]):
+    """
+    Combine per-chunk transcription responses into one response-like object.
+
+    Segment times are shifted by each chunk's start offset so _to_srt/_to_vtt
+    and the segment lists see one continuous timeline. Diarized speaker
+    labels are only consistent within a chunk, so they are prefixed with
+    the chunk number ("2:A" is speaker A of the second chunk).
+    """
+    merged = SimpleNamespace(
+        chunks=len(responses),
+        text=" ".join(r.text.strip() for r in responses),
+        language=getattr(responses[0], "language", None),
+        usage=SimpleNamespace(
+            input_tokens=sum(_extract_usage(r)["input_tokens"] for r in responses),
+            output_tokens=sum(_extract_usage(r)["output_tokens"] for r in responses),
+        ),
+    )
+
+    durations = [getattr(r, "duration", None) for r in responses]
+    if None not in durations:
+        merged.duration = sum(durations)
+
+    if all(hasattr(r, "segments") for r in responses):
+        merged.segments = []
+        for chunk_no, (r, offset) in enumerate(zip(responses, offsets), 1):
+            for seg in r.segments:
+                fields = {
+                    **vars(seg),
+                    "start": getattr(seg, "start", 0) + offset,
+                    "end": getattr(seg, "end", 0) + offset,
+                }
+                if getattr(seg, "speaker", None) is not None:
+                    fields["speaker"] = f"{chunk_no}:{seg.speaker}"
+                merged.segments.append(SimpleNamespace(**fields))
+
+    return merged
+
+
 def _extract_usage(response) -> dict:
     """Extract token usage from OpenAI transcription response."""
     usage = getattr(response, "usage", None)
@@ -252,8 +385,8 @@ def _to_srt(response) -> str:
 
     lines = []
     for i, seg in enumerate(response.segments, 1):
-        start = _format_timestamp_srt(getattr(seg, "start", 0))
-        end = _format_timestamp_srt(getattr(seg, "end", 0))
+        start = _format_timestamp(getattr(seg, "start", 0), ",")
+        end = _format_timestamp(getattr(seg, "end", 0), ",")
         text = getattr(seg, "text", "").strip()
         lines.append(f"{i}\n{start} --> {end}\n{text}\n")
 
@@ -265,34 +398,24 @@ def _to_vtt(response) -> str:
     if not hasattr(response, "segments"):
         return f"WEBVTT\n\n00:00:00.000 --> 00:00:10.000\n{response.text}\n"
 
-    lines = ["WEBVTT", ""]
+    lines = ["WEBVTT\n"]
     for seg in response.segments:
-        start = _format_timestamp_vtt(getattr(seg, "start", 0))
-        end = _format_timestamp_vtt(getattr(seg, "end", 0))
+        start = _format_timestamp(getattr(seg, "start", 0), ".")
+        end = _format_timestamp(getattr(seg, "end", 0), ".")
         text = getattr(seg, "text", "").strip()
-        lines.append(f"{start} --> {end}")
-        lines.append(text)
-        lines.append("")
+        # One entry per cue: same output as appending timing, text and blank separately
+        lines.append(f"{start} --> {end}\n{text}\n")
 
     return "\n".join(lines)
 
 
-def _format_timestamp_srt(seconds: float) -> str:
-    """Format seconds to SRT timestamp (HH:MM:SS,mmm)."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
-
-
-def _format_timestamp_vtt(seconds: float) -> str:
-    """Format seconds to WebVTT timestamp (HH:MM:SS.mmm)."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+def _format_timestamp(seconds: float, sep: str) -> str:
+    """Format seconds as HH:MM:SS<sep>mmm (sep is ',' for SRT, '.' for WebVTT)."""
+    millis = round(seconds * 1000)
+    secs, millis = divmod(millis, 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{sep}{millis:03d}"
 
 
 def main():
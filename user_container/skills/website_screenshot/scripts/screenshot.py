@@ -8,27 +8,78 @@ Capture full-page or element screenshots from web pages.
 
 Usage:
     uv run scripts/screenshot.py <url> <output_path> [options]
+    uv run scripts/screenshot.py --batch [options] < jobs.jsonl
 
 Options:
     --selector <css>    Screenshot specific element only
     --wait <selector>   Wait for element before screenshot
+    --wait-until <ev>   Navigation event to wait for: load (default), domcontentloaded, networkidle
+    --settle-ms <ms>    Extra delay after load when no --wait selector is given (default: 800)
     --full-page         Capture entire scrollable page
     --width <px>        Viewport width (default: 1280)
     --height <px>       Viewport height (default: 720)
     --timeout <ms>      Page load timeout (default: 30000)
+    --batch             Read JSON jobs from stdin (one per line), print one JSON result per line
+    --concurrency <n>   With --batch, render n pages at a time (default: 1)
 
 Examples:
     uv run scripts/screenshot.py "https://example.com" page.png --full-page
     uv run scripts/screenshot.py "https://example.com" mobile.png --width 375 --height 812
     uv run scripts/screenshot.py "https://example.com" header.png --selector "header"
+    echo '{"url": "https://example.com", "output_path": "a.png"}' | uv run scripts/screenshot.py --batch
 """
 
 import argparse
+import atexit
+import inspect
 import json
 import os
+import queue
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+# One Chromium per process, launched on first use and reused by every
+# screenshot; each call only opens (and closes) its own context
+_PLAYWRIGHT = None
+_BROWSER = None
+_BROWSER_HEADLESS = None
+
+
+def get_browser(headless: bool = True):
+    """Return the process-wide Chromium instance, launching it on first use."""
+    global _PLAYWRIGHT, _BROWSER, _BROWSER_HEADLESS
+    if _BROWSER is not None and _BROWSER_HEADLESS != headless:
+        close_browser()
+    if _BROWSER is None:
+        from playwright.sync_api import sync_playwright
+
+        _PLAYWRIGHT = sync_playwright().start()
+        # Launch browser with Docker-compatible settings
+        _BROWSER = _PLAYWRIGHT.chromium.launch(
+            headless=headless,
+            args=['--no-sandbox', '--disable-dev-shm-usage']
+        )
+        _BROWSER_HEADLESS = headless
+    return _BROWSER
+
+
+def close_browser() -> None:
+    """Close the shared browser and stop Playwright (registered with atexit)."""
+    global _PLAYWRIGHT, _BROWSER, _BROWSER_HEADLESS
+    if _BROWSER is not None:
+        try:
+            _BROWSER.close()
+        finally:
+            _BROWSER = None
+            _BROWSER_HEADLESS = None
+    if _PLAYWRIGHT is not None:
+        _PLAYWRIGHT.stop()
+        _PLAYWRIGHT = None
+
+
+atexit.register(close_browser)
+
 
 def screenshot(
     url: str,
@@ -41,6 +92,9 @@ def screenshot(
     timeout: int = 30000,
     user_agent: str = None,
     headless: bool = True,
+    browser=None,
+    wait_until: str = "load",
+    settle_ms: int = 800,
 ) -> dict:
     """
     Take a screenshot of a web page.
@@ -56,11 +110,19 @@ def screenshot(
         timeout: Page load timeout in ms
         user_agent: Custom user agent string
         headless: Run browser in headless mode
+        browser: Playwright Browser to use (default: the shared one from get_browser)
+        wait_until: Navigation event to wait for ("load", "domcontentloaded", "networkidle")
+        settle_ms: Delay after navigation when no `wait` selector is given
+
+    Navigation waits for "load" rather than "networkidle": pages with
+    analytics beacons or long-polling never go idle and would sit out the
+    full timeout. A short fixed settle delay covers late rendering instead;
+    pass `wait` for content that needs longer.
 
     Returns:
         dict with status and screenshot info
     """
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+    from playwright.sync_api import TimeoutError as PlaywrightTimeout
 
     # Ensure output directory exists
     output_dir = Path(output_path).parent
@@ -68,29 +130,28 @@ def screenshot(
         output_dir.mkdir(parents=True)
 
     try:
-        with sync_playwright() as p:
-            # Launch browser with Docker-compatible settings
-            browser = p.chromium.launch(
-                headless=headless,
-                args=['--no-sandbox', '--disable-dev-shm-usage']
-            )
-
-            # Create context with viewport size and optional user agent
-            context_options = {
-                "viewport": {"width": width, "height": height}
-            }
-            if user_agent:
-                context_options["user_agent"] = user_agent
-
-            context = browser.new_context(**context_options)
+        if browser is None:
+            browser = get_browser(headless)
+
+        # Create context with viewport size and optional user agent
+        context_options = {
+            "viewport": {"width": width, "height": height}
+        }
+        if user_agent:
+            context_options["user_agent"] = user_agent
+
+        context = browser.new_context(**context_options)
+        try:
             page = context.new_page()
 
             # Navigate to URL
-            page.goto(url, timeout=timeout, wait_until="networkidle")
+            page.goto(url, timeout=timeout, wait_until=wait_until)
 
-            # Wait for specific selector if specified
+            # Wait for specific selector if specified, otherwise let the page settle
             if wait:
                 page.wait_for_selector(wait, timeout=timeout)
+            elif settle_ms > 0:
+                page.wait_for_timeout(settle_ms)
 
             # Take screenshot
             screenshot_options = {"path": output_path}
@@ -99,7 +160,6 @@ def screenshot(
                 # Screenshot specific element
                 element = page.query_selector(selector)
                 if not element:
-                    browser.close()
                     return {
                         "status": "error",
                         "error": f"Element not found: {selector}",
@@ -109,28 +169,28 @@ def screenshot(
                 # Full page or viewport screenshot
                 screenshot_options["full_page"] = full_page
                 page.screenshot(**screenshot_options)
+        finally:
+            context.close()
 
-            browser.close()
+        # Get file info
+        file_path = Path(output_path)
+        file_size_kb = file_path.stat().st_size / 1024
 
-            # Get file info
-            file_path = Path(output_path)
-            file_size_kb = file_path.stat().st_size / 1024
-
-            # Get image dimensions
-            try:
-                from PIL import Image
-                with Image.open(output_path) as img:
-                    dimensions = {"width": img.width, "height": img.height}
-            except ImportError:
-                dimensions = {"width": width, "height": height if not full_page else "full"}
-
-            return {
-                "status": "success",
-                "url": url,
-                "output_path": str(file_path.absolute()),
-                "dimensions": dimensions,
-                "file_size_kb": round(file_size_kb, 2),
-            }
+        # Get image dimensions
+        try:
+            from PIL import Image
+            with Image.open(output_path) as img:
+                dimensions = {"width": img.width, "height": img.height}
+        except ImportError:
+            dimensions = {"width": width, "height": height if not full_page else "full"}
+
+        return {
+            "status": "success",
+            "url": url,
+            "output_path": str(file_path.absolute()),
+            "dimensions": dimensions,
+            "file_size_kb": round(file_size_kb, 2),
+        }
 
     except PlaywrightTimeout as e:
         return {
@@ -141,18 +201,126 @@ def screenshot(
         return {"status": "error", "error": str(e)}
 
 
+def screenshot_batch(jobs: list, **defaults) -> list:
+    """
+    Take several screenshots with one browser launch.
+
+    Args:
+        jobs: List of dicts of screenshot() arguments (url and output_path required)
+        **defaults: screenshot() arguments applied to every job unless it overrides them
+
+    Returns:
+        list of result dicts, in job order
+    """
+    return [screenshot(**{**defaults, **job}) for job in jobs]
+
+
+def screenshot_many(
+    jobs: list, concurrency: int = 4, process_parallel: bool = False, **defaults
+) -> list:
+    """
+    Take several screenshots with up to `concurrency` pages rendering at once.
+
+    Playwright's sync API is bound to the thread that started it, so in the
+    default thread mode each worker launches and owns its own browser and
+    drains a shared job queue. With process_parallel, worker processes each
+    reuse their own get_browser() singleton.
+
+    Args:
+        jobs: List of dicts of screenshot() arguments (url and output_path required)
+        concurrency: Number of worker threads (or processes)
+        process_parallel: Use worker processes instead of threads
+        **defaults: screenshot() arguments applied to every job unless it overrides them
+
+    Returns:
+        list of result dicts, in job order
+    """
+    jobs = [{**defaults, **job} for job in jobs]
+    workers = min(concurrency, len(jobs))
+    if workers <= 1:
+        return screenshot_batch(jobs)
+
+    if process_parallel:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_screenshot_job, jobs))
+
+    pending = queue.SimpleQueue()
+    for item in enumerate(jobs):
+        pending.put(item)
+    results = [None] * len(jobs)
+    headless = defaults.get("headless", True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(_screenshot_worker, pending, results, headless) for _ in range(workers)]:
+            future.result()
+    return results
+
+
+def _screenshot_job(job: dict) -> dict:
+    """Process-pool entry point: screenshot() with this process's shared browser."""
+    return screenshot(**job)
+
+
+def _screenshot_worker(pending: queue.SimpleQueue, results: list, headless: bool) -> None:
+    """Thread-pool worker: take jobs off `pending` with a browser owned by this thread."""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(
+            headless=headless,
+            args=['--no-sandbox', '--disable-dev-shm-usage']
+        )
+        try:
+            while True:
+                try:
+                    index, job = pending.get_nowait()
+                except queue.Empty:
+                    return
+                results[index] = screenshot(**job, browser=browser)
+        finally:
+            browser.close()
+
+
+# Keys a --batch job may set: screenshot() arguments, except the shared browser
+_JOB_KEYS = frozenset(inspect.signature(screenshot).parameters) - {"browser"}
+
+
+def _parse_job(line: str) -> tuple[dict | None, str | None]:
+    """Parse one --batch line into screenshot() arguments; returns (job, error)."""
+    try:
+        job = json.loads(line)
+    except json.JSONDecodeError as e:
+        return None, f"Invalid JSON: {e}"
+    if not isinstance(job, dict):
+        return None, "Job must be a JSON object"
+    unknown = job.keys() - _JOB_KEYS
+    if unknown:
+        return None, f"Unknown job keys: {', '.join(sorted(unknown))}"
+    missing = [key for key in ("url", "output_path") if not job.get(key)]
+    if missing:
+        return None, f"Missing job keys: {', '.join(missing)}"
+    return job, None
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Take screenshots of web pages"
     )
-    parser.add_argument("url", help="URL to screenshot")
-    parser.add_argument("output_path", help="Path to save screenshot")
+    parser.add_argument("url", nargs="?", help="URL to screenshot")
+    parser.add_argument("output_path", nargs="?", help="Path to save screenshot")
     parser.add_argument(
         "--selector", "-s", help="CSS selector to screenshot specific element"
     )
     parser.add_argument(
         "--wait", "-w", help="CSS selector to wait for before screenshot"
     )
+    parser.add_argument(
+        "--wait-until", choices=["load", "domcontentloaded", "networkidle"], default="load",
+        help="Navigation event to wait for (default: load)"
+    )
+    parser.add_argument(
+        "--settle-ms", type=int, default=800,
+        help="Delay after load when no --wait selector is given (default: 800)"
+    )
     parser.add_argument(
         "--full-page", "-f", action="store_true", help="Capture entire scrollable page"
     )
@@ -171,14 +339,22 @@ def main():
     parser.add_argument(
         "--no-headless", action="store_true", help="Show browser window"
     )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Read JSON jobs ({\"url\": ..., \"output_path\": ..., ...}) from stdin, one per line"
+    )
+    parser.add_argument(
+        "--concurrency", "-c", type=int, default=1,
+        help="With --batch, number of pages rendered at once (default: 1)"
+    )
 
     args = parser.parse_args()
 
-    result = screenshot(
-        url=args.url,
-        output_path=args.output_path,
+    options = dict(
         selector=args.selector,
         wait=args.wait,
+        wait_until=args.wait_until,
+        settle_ms=args.settle_ms,
         full_page=args.full_page,
         width=args.width,
         height=args.height,
@@ -187,6 +363,28 @@ def main():
         headless=not args.no_headless,
     )
 
+    if args.batch:
+        # A bad line gets its own error result; the other jobs still run
+        results, jobs = [], []
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            job, error = _parse_job(line)
+            if error:
+                results.append({"status": "error", "error": error})
+            else:
+                results.append(None)
+                jobs.append(job)
+        rendered = iter(screenshot_many(jobs, concurrency=args.concurrency, **options))
+        for result in results:
+            print(json.dumps(result or next(rendered), ensure_ascii=False), flush=True)
+        return
+
+    if not args.url or not args.output_path:
+        parser.error("url and output_path are required (or use --batch)")
+
+    result = screenshot(url=args.url, output_path=args.output_path, **options)
+
     print(json.dumps(result, indent=2, ensure_ascii=False))
 
 
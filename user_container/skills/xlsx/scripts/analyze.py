@@ -23,52 +23,157 @@ Options:
 
 import json
 import sys
+from collections import Counter
 from pathlib import Path
 
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string, range_boundaries
+from openpyxl.xml.constants import SHEET_MAIN_NS
+from openpyxl.xml.functions import iterparse
+
+# Exact-type lookup for cell values; anything else (datetime, date, time,
+# timedelta) counts as a date. Strings are split into formula/string.
+CELL_TYPES = {str: "string", bool: "boolean", int: "number", float: "number", type(None): "empty"}
+
+_MERGE_CELL_TAG = f"{{{SHEET_MAIN_NS}}}mergeCell"
+_CONDITIONAL_FORMAT_TAG = f"{{{SHEET_MAIN_NS}}}conditionalFormatting"
+_DATA_VALIDATION_TAG = f"{{{SHEET_MAIN_NS}}}dataValidation"
+_ROW_TAG = f"{{{SHEET_MAIN_NS}}}row"
+
+
+def _cell_column(cell_el, default: int) -> int:
+    """Column index of a <c> element from its r="B7" reference (optional in the spec)."""
+    ref = cell_el.get("r")
+    return column_index_from_string(coordinate_from_string(ref)[0]) if ref else default
+
+
+def read_sheet_extras(ws) -> dict:
+    """
+    Scan a read-only worksheet's XML for what read-only mode doesn't load,
+    and size the worksheet from the cells actually present.
+
+    Counts merged ranges, conditional formats and data validations, and
+    measures the cell extent from the <row>/<c> references plus merged
+    ranges (a regular worksheet creates cells for those). This reads the
+    sheet XML once more, next to the cell stream, but builds no cells. The
+    <dimension> element can't be trusted for the extent: writers leave it
+    stale or at "A1".
+
+    This is the only place that uses openpyxl's ReadOnlyWorksheet internals
+    (_get_source() and the _min_row/_min_column/_max_row/_max_column fields,
+    as in openpyxl 3.0-3.1). Without them the counts are None and the sheet
+    is sized with the public reset_dimensions() + calculate_dimension(force=True),
+    which is an extra pass over the cells.
+    """
+    if not (hasattr(ws, "_get_source") and hasattr(ws, "_max_column")):
+        ws.reset_dimensions()
+        try:
+            ws.calculate_dimension(force=True)
+        except Exception:
+            pass  # no rows: openpyxl's forced calculation fails, the sheet stays unsized
+        return {"merged_cells": None, "conditional_formats": None, "data_validations": None}
+
+    merged = 0
+    cf_ranges = set()
+    validations = 0
+    boxes = []  # (min_row, min_col, max_row, max_col): the cells first, then each merged range
+    row_idx = 0
+    with ws._get_source() as src:
+        for _event, el in iterparse(src):
+            tag = el.tag
+            if tag == _ROW_TAG:
+                row_idx = int(el.get("r") or row_idx + 1)
+                if len(el):
+                    first = _cell_column(el[0], 1)
+                    last = _cell_column(el[-1], len(el))
+                    if boxes:
+                        top, left, _, right = boxes[0]
+                        boxes[0] = (top, min(left, first), row_idx, max(right, last))
+                    else:
+                        boxes.append((row_idx, first, row_idx, last))
+                el.clear()
+            elif tag == _MERGE_CELL_TAG:
+                merged += 1
+                min_col, min_row, max_col, max_row = range_boundaries(el.get("ref"))
+                boxes.append((min_row, min_col, max_row, max_col))
+            elif tag == _CONDITIONAL_FORMAT_TAG:
+                # Rules on the same range are grouped together, as openpyxl does
+                cf_ranges.add(el.get("sqref"))
+            elif tag == _DATA_VALIDATION_TAG:
+                validations += 1
+    # Size the sheet so iteration covers every cell; an empty sheet reports
+    # A1:A1, like a regular worksheet
+    ws._min_row = min((b[0] for b in boxes), default=1)
+    ws._min_column = min((b[1] for b in boxes), default=1)
+    ws._max_row = max((b[2] for b in boxes), default=1)
+    ws._max_column = max((b[3] for b in boxes), default=1)
+    return {
+        "merged_cells": merged,
+        "conditional_formats": len(cf_ranges),
+        "data_validations": validations,
+    }
 
 
 def inspect_sheet(ws, include_formulas: bool = False) -> dict:
     """Inspect a single worksheet."""
+    read_only = ws.parent.read_only
+    if read_only:
+        extras = read_sheet_extras(ws)  # also sizes the sheet from its real cells
+        # Unsized only when the fallback found no rows
+        dimensions = ws.calculate_dimension() if ws.max_row else "A1:A1"
+    else:
+        extras = {
+            "merged_cells": len(ws.merged_cells.ranges),
+            # Count conditional formatting rules
+            "conditional_formats": len(ws.conditional_formatting._cf_rules),
+            # Count data validations
+            "data_validations": len(ws.data_validations.dataValidation) if ws.data_validations else 0,
+        }
+        dimensions = ws.dimensions
+
     info = {
         "name": ws.title,
-        "dimensions": ws.dimensions or "Empty",
-        "max_row": ws.max_row,
-        "max_column": ws.max_column,
-        "merged_cells": len(ws.merged_cells.ranges),
+        "dimensions": dimensions or "Empty",
+        "max_row": ws.max_row or 1,
+        "max_column": ws.max_column or 1,
+        "merged_cells": extras["merged_cells"],
         "formulas": {"count": 0, "cells": []},
         "data_types": {"string": 0, "number": 0, "date": 0, "boolean": 0, "empty": 0, "formula": 0},
     }
-
-    # Count conditional formatting rules
-    info["conditional_formats"] = len(ws.conditional_formatting._cf_rules)
-
-    # Count data validations
-    info["data_validations"] = len(ws.data_validations.dataValidation) if ws.data_validations else 0
+    info["conditional_formats"] = extras["conditional_formats"]
+    info["data_validations"] = extras["data_validations"]
 
     # Analyze cells
-    for row in ws.iter_rows():
-        for cell in row:
-            if cell.value is None:
-                info["data_types"]["empty"] += 1
-            elif isinstance(cell.value, str):
-                if cell.value.startswith("="):
-                    info["data_types"]["formula"] += 1
+    data_types = info["data_types"]
+    if include_formulas:
+        formula_cells = info["formulas"]["cells"]
+        for row in ws.iter_rows():
+            for cell in row:
+                value = cell.value
+                kind = CELL_TYPES.get(type(value), "date")
+                if kind == "string" and value.startswith("="):
+                    kind = "formula"
                     info["formulas"]["count"] += 1
-                    if include_formulas:
-                        info["formulas"]["cells"].append({
+                    if len(formula_cells) <= 100:  # One past the limit marks truncation
+                        formula_cells.append({
                             "cell": cell.coordinate,
-                            "formula": cell.value[:100]  # Truncate long formulas
+                            "formula": value[:100]  # Truncate long formulas
                         })
-                else:
-                    info["data_types"]["string"] += 1
-            elif isinstance(cell.value, bool):
-                info["data_types"]["boolean"] += 1
-            elif isinstance(cell.value, (int, float)):
-                info["data_types"]["number"] += 1
-            else:
-                info["data_types"]["date"] += 1
+                data_types[kind] += 1
+    else:
+        # No formula locations needed: count raw values per type, never
+        # building cell objects, then split formulas out of the strings
+        type_counts = Counter()
+        formulas = 0
+        for row in ws.iter_rows(values_only=True):
+            type_counts.update(map(type, row))
+            formulas += sum(1 for value in row if type(value) is str and value.startswith("="))
+        for value_type, count in type_counts.items():
+            data_types[CELL_TYPES.get(value_type, "date")] += count
+        data_types["string"] -= formulas
+        data_types["formula"] += formulas
+        info["formulas"]["count"] += formulas
 
     # Limit formula list
     if include_formulas and len(info["formulas"]["cells"]) > 100:
@@ -89,7 +194,9 @@ def inspect_workbook(filepath: str, include_formulas: bool = False, full: bool =
         return {"error": f"File not found: {filepath}"}
 
     try:
-        wb = load_workbook(filepath, data_only=False)
+        # Read-only mode streams cells from the XML instead of building the
+        # full (styled) cell model for the whole workbook up front
+        wb = load_workbook(filepath, read_only=True, data_only=False)
     except Exception as e:
         return {"error": f"Failed to open file: {e}"}
 
@@ -17,49 +17,131 @@ Options:
     --sheet NAME    Compare specific sheet only
     --values        Compare calculated values (default: compare formulas)
     --summary       Show summary only, not individual differences
+                    (heavily changed sheets stop early with a lower bound)
 """
 
+import heapq
 import json
 import sys
+from itertools import zip_longest
 from pathlib import Path
 
 import pandas as pd
 from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+
+# With --summary, a sheet walk stops once it has seen this many differences
+# in at least this many cells and reports the count as a lower bound
+EARLY_STOP_DIFFERENCES = 1000
+EARLY_STOP_MIN_CELLS = 10_000
+
+
+def read_sheet_values(ws) -> tuple[dict, int, int]:
+    """
+    Collect the non-empty cells of a worksheet.
+
+    Returns ({(row, col): value}, max_row, max_column). Expects an unsized
+    read-only sheet (see compare_sheets), so it is sized from the cells present.
+    """
+    values = {}
+    max_row = max_col = 1
+    for row_idx, row in enumerate(ws.iter_rows(values_only=True), 1):
+        if not row:
+            continue
+        # Unsized rows end at their last cell
+        max_row = row_idx
+        max_col = max(max_col, len(row))
+        for col_idx, value in enumerate(row, 1):
+            if value is not None:
+                values[row_idx, col_idx] = value
+    return values, max_row, max_col
+
+
+def count_sheet_differences(ws1, ws2) -> dict:
+    """
+    Count differing cells walking both sheets row by row in lockstep.
+
+    Stops reading both files once EARLY_STOP_DIFFERENCES is exceeded. The
+    rest of the sheet is unknown then, so the result has
+    "cells_different_min" and "stopped_early" instead of an exact count and
+    a match percentage. Otherwise the result equals the full comparison.
+    """
+    max_row = max_col = 1
+    rows_compared = cells_different = 0
+    stopped_early = False
+
+    rows = zip_longest(ws1.iter_rows(values_only=True), ws2.iter_rows(values_only=True), fillvalue=())
+    for rows_compared, (row1, row2) in enumerate(rows, 1):
+        if row1 or row2:
+            # Unsized rows end at their last cell
+            max_row = rows_compared
+            max_col = max(max_col, len(row1), len(row2))
+        # Positions past both rows' ends are empty in both: zip_longest pads with None
+        cells_different += sum(1 for val1, val2 in zip_longest(row1, row2) if val1 != val2)
+        if cells_different > EARLY_STOP_DIFFERENCES and rows_compared * max_col > EARLY_STOP_MIN_CELLS:
+            stopped_early = True
+            break
+
+    if stopped_early:
+        return {
+            "cells_compared": rows_compared * max_col,
+            "cells_different_min": cells_different,
+            "stopped_early": True,
+            "rows_compared": rows_compared,
+        }
+    cells_compared = max_row * max_col
+    return {
+        "cells_compared": cells_compared,
+        "cells_different": cells_different,
+        "match_percentage": round((1 - cells_different / max(cells_compared, 1)) * 100, 2),
+    }
 
 
-def compare_sheets(ws1, ws2, compare_values: bool = False) -> dict:
-    """Compare two worksheets cell by cell."""
-    differences = []
-
-    max_row = max(ws1.max_row, ws2.max_row)
-    max_col = max(ws1.max_column, ws2.max_column)
-
-    cells_compared = 0
-    cells_different = 0
-
-    for row in range(1, max_row + 1):
-        for col in range(1, max_col + 1):
-            cell1 = ws1.cell(row=row, column=col)
-            cell2 = ws2.cell(row=row, column=col)
-
-            val1 = cell1.value
-            val2 = cell2.value
-
-            cells_compared += 1
+def compare_sheets(ws1, ws2, compare_values: bool = False, summary_only: bool = False) -> dict:
+    """Compare two worksheets cell by cell.
 
-            # Skip if both empty
-            if val1 is None and val2 is None:
-                continue
+    With summary_only, no differences are listed and heavily changed
+    sheets stop early with a lower bound (see count_sheet_differences).
+    """
+    differences = []
 
-            # Compare values
-            if val1 != val2:
-                cells_different += 1
-                if len(differences) < 100:  # Limit to first 100 differences
-                    differences.append({
-                        "cell": cell1.coordinate,
-                        "file1": str(val1)[:50] if val1 else "(empty)",
-                        "file2": str(val2)[:50] if val2 else "(empty)",
-                    })
+    # Ignore the declared <dimension>: writers leave it stale or at "A1", and
+    # read-only iteration would silently stop there
+    ws1.reset_dimensions()
+    ws2.reset_dimensions()
+
+    if summary_only:
+        counts = count_sheet_differences(ws1, ws2)
+        counts["differences"] = differences
+        counts["differences_truncated"] = False
+        return counts
+
+    # Only non-empty cells can differ: walk the union of both sheets'
+    # non-empty cells instead of every position in the used range
+    values1, max_row1, max_col1 = read_sheet_values(ws1)
+    values2, max_row2, max_col2 = read_sheet_values(ws2)
+
+    max_row = max(max_row1, max_row2)
+    max_col = max(max_col1, max_col2)
+
+    cells_compared = max_row * max_col
+
+    # Compare values
+    different = [
+        key for key in values1.keys() | values2.keys()
+        if values1.get(key) != values2.get(key)
+    ]
+    cells_different = len(different)
+
+    # Limit to first 100 differences, in row-major order
+    for row, col in heapq.nsmallest(100, different):
+        val1 = values1.get((row, col))
+        val2 = values2.get((row, col))
+        differences.append({
+            "cell": f"{get_column_letter(col)}{row}",
+            "file1": str(val1)[:50] if val1 else "(empty)",
+            "file2": str(val2)[:50] if val2 else "(empty)",
+        })
 
     return {
         "cells_compared": cells_compared,
@@ -82,8 +164,9 @@ def compare_workbooks(file1: str, file2: str, sheet_name: str = None,
         return {"error": f"File not found: {file2}"}
 
     try:
-        wb1 = load_workbook(file1, data_only=compare_values)
-        wb2 = load_workbook(file2, data_only=compare_values)
+        # Read-only: cells are streamed once per sheet, never built as a full model
+        wb1 = load_workbook(file1, read_only=True, data_only=compare_values)
+        wb2 = load_workbook(file2, read_only=True, data_only=compare_values)
     except Exception as e:
         return {"error": f"Failed to open files: {e}"}
 
@@ -117,15 +200,25 @@ def compare_workbooks(file1: str, file2: str, sheet_name: str = None,
         ws1 = wb1[sheet]
         ws2 = wb2[sheet]
 
-        comparison = compare_sheets(ws1, ws2, compare_values)
-        total_different += comparison["cells_different"]
-
-        sheet_result = {
-            "sheet": sheet,
-            "cells_compared": comparison["cells_compared"],
-            "cells_different": comparison["cells_different"],
-            "match_percentage": comparison["match_percentage"],
-        }
+        comparison = compare_sheets(ws1, ws2, compare_values, summary_only)
+
+        if comparison.get("stopped_early"):
+            total_different += comparison["cells_different_min"]
+            sheet_result = {
+                "sheet": sheet,
+                "cells_compared": comparison["cells_compared"],
+                "cells_different_min": comparison["cells_different_min"],
+                "stopped_early": True,
+                "rows_compared": comparison["rows_compared"],
+            }
+        else:
+            total_different += comparison["cells_different"]
+            sheet_result = {
+                "sheet": sheet,
+                "cells_compared": comparison["cells_compared"],
+                "cells_different": comparison["cells_different"],
+                "match_percentage": comparison["match_percentage"],
+            }
 
         if not summary_only:
             sheet_result["differences"] = comparison["differences"]
@@ -139,13 +232,24 @@ def compare_workbooks(file1: str, file2: str, sheet_name: str = None,
 
     # Overall summary
     total_compared = sum(s["cells_compared"] for s in result["sheet_comparisons"])
-    result["summary"] = {
-        "sheets_compared": len(sheets_to_compare),
-        "total_cells_compared": total_compared,
-        "total_cells_different": total_different,
-        "overall_match_percentage": round((1 - total_different / max(total_compared, 1)) * 100, 2),
-        "identical": total_different == 0 and not result["structure"]["sheets_only_in_file1"] and not result["structure"]["sheets_only_in_file2"]
-    }
+    identical = total_different == 0 and not result["structure"]["sheets_only_in_file1"] and not result["structure"]["sheets_only_in_file2"]
+    if any(s.get("stopped_early") for s in result["sheet_comparisons"]):
+        # Some sheets were not read to the end: the totals are lower bounds
+        result["summary"] = {
+            "sheets_compared": len(sheets_to_compare),
+            "total_cells_compared": total_compared,
+            "total_cells_different_min": total_different,
+            "stopped_early": True,
+            "identical": identical,
+        }
+    else:
+        result["summary"] = {
+            "sheets_compared": len(sheets_to_compare),
+            "total_cells_compared": total_compared,
+            "total_cells_different": total_different,
+            "overall_match_percentage": round((1 - total_different / max(total_compared, 1)) * 100, 2),
+            "identical": identical,
+        }
 
     return result
 
@@ -160,6 +264,7 @@ def main():
         print("  --sheet NAME    Compare specific sheet only")
         print("  --values        Compare calculated values (default: compare formulas)")
         print("  --summary       Show summary only, not individual differences")
+        print("                  (heavily changed sheets stop early with a lower bound)")
         print()
         print("Output includes:")
         print("  - Sheet structure differences")
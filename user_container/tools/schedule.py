@@ -8,7 +8,7 @@ and to list existing scheduled jobs.
 from typing import Any, Callable, Dict, TYPE_CHECKING
 
 from user_container.tools.registry import ToolSchema, make_parameters
-from user_container.scheduler.cron_utils import parse_cron, humanize_cron
+from user_container.scheduler.cron_utils import parse_cron, humanize_cron, get_next_run
 
 if TYPE_CHECKING:
     from user_container.scheduler.scheduler import JobScheduler
@@ -354,7 +354,6 @@ def make_update_scheduled_job_tool(
                 }
             updates["cron_expression"] = cron
             # Update next_run_at when cron changes
-            from user_container.scheduler.cron_utils import get_next_run
             updates["next_run_at"] = get_next_run(cron)
 
         if args.get("schedule_description"):